@@ -1,5 +1,6 @@
 import { createAsyncThunk, createSlice } from "@reduxjs/toolkit";
 import { apiFetch } from "../../api/client";
+import { adminApi } from "../../api/admin";
 
 const initialState = {
   items: [],
@@ -12,7 +13,7 @@ export const fetchUsers = createAsyncThunk(
   async (_, thunkAPI) => {
     const token = thunkAPI.getState().auth.token;
     try {
-      const data = await apiFetch("/api/admin/users", { token });
+      const data = await adminApi.users(token);
       return data.users;
     } catch (e) {
       return thunkAPI.rejectWithValue(e.message);
@@ -1,15 +1,30 @@
 import { apiFetch } from "./client";
 
+// Admin lists are keyset-paginated; follow next_cursor until the last page
+// so callers keep getting every row as { [key]: [...] }.
+async function fetchAllPages(path, key, token) {
+  const rows = [];
+  let cursor = null;
+  do {
+    const params = new URLSearchParams({ limit: "500" });
+    if (cursor) params.set("cursor", cursor);
+    const data = await apiFetch(`${path}?${params}`, { token });
+    rows.push(...(Array.isArray(data?.[key]) ? data[key] : []));
+    cursor = data?.next_cursor || null;
+  } while (cursor);
+  return { [key]: rows };
+}
+
 export const adminApi = {
   
-  users: (token) => apiFetch("/api/admin/users", { token }),
+  users: (token) => fetchAllPages("/api/admin/users", "users", token),
   createUser: (token, body) =>
     apiFetch("/api/admin/users", { method: "POST", token, body }),
   patchUser: (token, id, body) =>
     apiFetch(`/api/admin/users/${id}`, { method: "PATCH", token, body }),
 
   
-  spaces: (token) => apiFetch("/api/admin/spaces", { token }),
+  spaces: (token) => fetchAllPages("/api/admin/spaces", "spaces", token),
   patchSpace: (token, id, body) =>
     apiFetch(`/api/admin/spaces/${id}`, { method: "PATCH", token, body }),
 
@@ -18,7 +33,8 @@ export const adminApi = {
     apiFetch("/api/admin/spaces", { method: "POST", token, body }),
 
   
-  bookings: (token) => apiFetch("/api/admin/bookings", { token }),
+  bookings: (token) => fetchAllPages("/api/admin/bookings", "bookings", token),
+  stats: (token) => apiFetch("/api/admin/stats", { token }),
   patchBooking: (token, id, body) =>
     apiFetch(`/api/admin/bookings/${id}`, { method: "PATCH", token, body }),
 };
\ No newline at end of file
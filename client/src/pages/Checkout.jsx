@@ -6,6 +6,8 @@ import { Elements, CardElement, useStripe, useElements } from "@stripe/react-str
 import { apiFetch } from "../api/client";
 
 const stripePromise = loadStripe(import.meta.env.VITE_STRIPE_PUBLISHABLE_KEY);
+const CONFIRM_POLL_ATTEMPTS = 20;
+const CONFIRM_POLL_INTERVAL_MS = 1000;
 
 function CheckoutForm() {
   const { bookingId } = useParams();
@@ -96,11 +98,20 @@ function CheckoutForm() {
         return;
       }
 
-      const data = await apiFetch(`/api/payments/confirm/${paymentIntent.id}`, {
-        method: "POST",
-        token,
-      });
+      // 202 while the Stripe webhook has not been processed yet
+      let data = null;
+      for (let attempt = 0; attempt < CONFIRM_POLL_ATTEMPTS; attempt += 1) {
+        data = await apiFetch(`/api/payments/confirm/${paymentIntent.id}`, {
+          method: "POST",
+          token,
+        });
+        if (data?.status !== "processing") break;
+        await new Promise((resolve) => setTimeout(resolve, CONFIRM_POLL_INTERVAL_MS));
+      }
 
+      if (data?.status === "processing") {
+        throw new Error("Payment is still processing. Check your invoices in a moment.");
+      }
       if (!data?.invoice_id) {
         throw new Error("Payment confirmed but invoice_id missing.");
       }
@@ -1,4 +1,4 @@
-import React, { useEffect, useMemo, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { Link } from "react-router-dom";
 import { useSelector } from "react-redux";
 import { apiFetch } from "../api/client";
@@ -41,63 +41,83 @@ function SpaceImage({ src, alt }) {
   );
 }
 
+const PAGE_SIZE = 24;
+
+const SORT_PARAMS = {
+  name: "name",
+  priceAsc: "price_asc",
+  priceDesc: "price_desc",
+};
+
+// search, sort and paging run server-side; one page is downloaded at a time
+function fetchSpacesPage({ token, sort, q, cursor }) {
+  const params = new URLSearchParams({
+    sort: SORT_PARAMS[sort] || "name",
+    limit: String(PAGE_SIZE),
+  });
+  if (q) params.set("q", q);
+  if (cursor) params.set("cursor", cursor);
+  return apiFetch(`/api/spaces?${params.toString()}`, { token });
+}
+
 export default function SpacesPage() {
   const { token } = useSelector((s) => s.auth);
 
   const [spaces, setSpaces] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [err, setErr] = useState("");
 
   const [query, setQuery] = useState("");
   const [sort, setSort] = useState("name"); // name | priceAsc | priceDesc
 
+  const [debouncedQuery, setDebouncedQuery] = useState("");
+
+  // bumped on every new search so a late "load more" response is dropped
+  const searchId = useRef(0);
+
   useEffect(() => {
-    let alive = true;
+    const t = setTimeout(() => setDebouncedQuery(query.trim()), 250);
+    return () => clearTimeout(t);
+  }, [query]);
+
+  useEffect(() => {
+    const id = ++searchId.current;
     (async () => {
       try {
         setErr("");
         setLoading(true);
-
-        // if your API base is NOT /api, use "/api/spaces"
-        const data = await apiFetch("/api/spaces", { token });
-
-        if (!alive) return;
-        setSpaces(Array.isArray(data) ? data : data?.spaces || []);
+        const data = await fetchSpacesPage({ token, sort, q: debouncedQuery });
+        if (id !== searchId.current) return;
+        setSpaces(data?.spaces || []);
+        setNextCursor(data?.next_cursor || null);
       } catch (e) {
-        if (!alive) return;
+        if (id !== searchId.current) return;
         setErr(e.message || "Failed to load spaces");
       } finally {
-        if (alive) setLoading(false);
+        if (id === searchId.current) setLoading(false);
       }
     })();
-    return () => {
-      alive = false;
-    };
-  }, [token]);
-
-  const filtered = useMemo(() => {
-    const q = query.trim().toLowerCase();
-    let list = [...spaces];
-
-    if (q) {
-      list = list.filter((s) => {
-        const name = (s.name || "").toLowerCase();
-        const loc = (s.location || s.city || "").toLowerCase();
-        const desc = (s.description || "").toLowerCase();
-        return name.includes(q) || loc.includes(q) || desc.includes(q);
-      });
+  }, [token, debouncedQuery, sort]);
+
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    const id = searchId.current;
+    try {
+      setErr("");
+      setLoadingMore(true);
+      const data = await fetchSpacesPage({ token, sort, q: debouncedQuery, cursor: nextCursor });
+      if (id !== searchId.current) return;
+      setSpaces((cur) => [...cur, ...(data?.spaces || [])]);
+      setNextCursor(data?.next_cursor || null);
+    } catch (e) {
+      if (id !== searchId.current) return;
+      setErr(e.message || "Failed to load more spaces");
+    } finally {
+      setLoadingMore(false);
     }
-
-    if (sort === "name") {
-      list.sort((a, b) => (a.name || "").localeCompare(b.name || ""));
-    } else if (sort === "priceAsc") {
-      list.sort((a, b) => (a.price_per_hour ?? 0) - (b.price_per_hour ?? 0));
-    } else if (sort === "priceDesc") {
-      list.sort((a, b) => (b.price_per_hour ?? 0) - (a.price_per_hour ?? 0));
-    }
-
-    return list;
-  }, [spaces, query, sort]);
+  };
 
   return (
     <div className="mx-auto max-w-6xl px-4 py-8">
@@ -143,13 +163,13 @@ export default function SpacesPage() {
             <div key={i} className="h-60 animate-pulse rounded-2xl border border-gray-200 bg-white" />
           ))}
         </div>
-      ) : filtered.length === 0 ? (
+      ) : spaces.length === 0 ? (
         <div className="mt-8">
           <EmptyState />
         </div>
       ) : (
         <div className="mt-8 grid gap-4 md:grid-cols-3">
-          {filtered.map((s) => (
+          {spaces.map((s) => (
             <div
               key={s.id}
               className="group overflow-hidden rounded-2xl border border-gray-200 bg-white shadow-sm transition hover:-translate-y-0.5 hover:shadow-md"
@@ -204,6 +224,19 @@ export default function SpacesPage() {
           ))}
         </div>
       )}
+
+      {!loading && nextCursor && (
+        <div className="mt-8 flex justify-center">
+          <button
+            type="button"
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="rounded-xl border border-gray-300 bg-white px-4 py-2 text-sm font-semibold text-gray-800 shadow-sm hover:bg-gray-50 disabled:opacity-60"
+          >
+            {loadingMore ? "Loading…" : "Load more"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -17,18 +17,14 @@ export default function AdminDashboard() {
         setErr("");
         setLoading(true);
 
-        const [u, s, b] = await Promise.all([
-          adminApi.users(token),
-          adminApi.spaces(token),
-          adminApi.bookings(token),
-        ]);
+        const data = await adminApi.stats(token);
 
         if (!alive) return;
 
         setStats({
-          users: (u?.users || []).length,
-          spaces: (s?.spaces || []).length,
-          bookings: (b?.bookings || []).length,
+          users: data?.users?.total ?? 0,
+          spaces: data?.spaces?.total ?? 0,
+          bookings: data?.bookings?.total ?? 0,
         });
       } catch (e) {
         if (!alive) return;
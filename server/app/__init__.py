@@ -5,6 +5,15 @@ import os
 
 from app.config import Config
 from app.extensions import db, migrate, jwt
+from app.utils import database, instrumentation, metrics
+from app.utils.authz import user_state_cache
+from app.utils.cache import space_cache, stats_cache
+from app.utils.firebase_tokens import firebase_verifier
+from app.utils.passwords import PasswordHashingBusy, password_hasher
+from app.utils.ratelimit import limiter
+from app.utils.replicas import replica_router
+from app.utils.stripe_events import event_worker
+from app.utils.stripe_gateway import stripe_gateway
 
 cors = CORS()
 
@@ -27,6 +36,12 @@ def create_app():
         db_url or app.config.get("SQLALCHEMY_DATABASE_URI")
     )
 
+    # explicit SQLALCHEMY_ENGINE_OPTIONS entries win over the DB_* settings
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **database.engine_options(app.config["SQLALCHEMY_DATABASE_URI"] or "", app.config),
+        **(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}),
+    }
+
     
     env = (app.config.get("ENV") or "").lower()
     is_dev = env in ("development", "dev")
@@ -40,8 +55,20 @@ def create_app():
 
     
     db.init_app(app)
+    database.init_app(app)
+    replica_router.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    space_cache.init_app(app)
+    stats_cache.init_app(app)
+    user_state_cache.init_app(app)
+    limiter.init_app(app)
+    password_hasher.init_app(app)
+    firebase_verifier.init_app(app)
+    stripe_gateway.init_app(app)
+    event_worker.init_app(app)
+    instrumentation.init_app(app)
+    metrics.init_app(app)
 
     
     from app import models  # noqa: F401
@@ -81,6 +108,16 @@ def create_app():
     app.register_blueprint(invoices_bp)
     app.register_blueprint(payments_bp)
 
+    from app.cli import passwords_cli, spaces_cli, stripe_cli
+
+    app.cli.add_command(spaces_cli)
+    app.cli.add_command(passwords_cli)
+    app.cli.add_command(stripe_cli)
+
+    @app.errorhandler(PasswordHashingBusy)
+    def password_hashing_busy(_error):
+        return jsonify({"error": "server busy, try again shortly"}), 503, {"Retry-After": "1"}
+
     @app.get("/health")
     def health():
         return jsonify({"ok": True, "service": "spacer-api"}), 200
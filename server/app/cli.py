@@ -0,0 +1,173 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.utils.passwords import PasswordHasher
+from app.utils.stripe_gateway import StripeGateway, stripe_gateway
+from app.utils.space_import import IMPORT_CHUNK_SIZE, IMPORT_FORMATS, import_spaces, parse_rows
+
+
+spaces_cli = AppGroup("spaces", help="Space catalogue maintenance.")
+passwords_cli = AppGroup("passwords", help="Password hashing policy.")
+stripe_cli = AppGroup("stripe", help="Stripe gateway tooling.")
+
+
+@spaces_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format", "fmt", type=click.Choice(IMPORT_FORMATS),
+    help="Defaults to the file extension (.csv, otherwise ndjson).",
+)
+@click.option("--chunk-size", default=IMPORT_CHUNK_SIZE, show_default=True)
+@click.option("--dry-run", is_flag=True, help="Validate and dedupe without inserting.")
+def import_command(path, fmt, chunk_size, dry_run):
+    """Bulk-import spaces from a CSV or NDJSON file."""
+    fmt = fmt or ("csv" if path.lower().endswith(".csv") else "ndjson")
+
+    with open(path, newline="", encoding="utf-8") as fh:
+        report = import_spaces(parse_rows(fh, fmt), chunk_size=chunk_size, dry_run=dry_run)
+
+    for error in report["errors"]:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+
+    click.echo(
+        f"read {report['read']}, inserted {report['inserted']}, "
+        f"duplicates {report['duplicates']}, invalid {report['invalid']} "
+        f"in {report['seconds']}s ({report['rows_per_sec']} rows/sec)"
+        + (" [dry run]" if dry_run else "")
+    )
+
+
+@passwords_cli.command("benchmark")
+@click.option(
+    "--method", "methods", multiple=True,
+    help="Policy to measure (repeatable). Defaults to PASSWORD_HASH_METHOD.",
+)
+@click.option("--logins", default=50, show_default=True, help="Verifications per policy.")
+@click.option("--concurrency", default=8, show_default=True, help="Concurrent login threads.")
+@click.option(
+    "--workers", type=int,
+    help="Hashing processes. Defaults to PASSWORD_HASH_WORKERS (0 = calling thread).",
+)
+def benchmark_command(methods, logins, concurrency, workers):
+    """Report logins/sec (password verifications) per hashing policy."""
+    methods = methods or (current_app.config.get("PASSWORD_HASH_METHOD", "pbkdf2:sha256"),)
+    if workers is None:
+        workers = current_app.config.get("PASSWORD_HASH_WORKERS", 0)
+
+    for method in methods:
+        hasher = PasswordHasher(method, workers=workers, max_pending=concurrency)
+        try:
+            stored = hasher.hash("benchmark-password-1")
+            started = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as threads:
+                results = list(
+                    threads.map(lambda _: hasher.verify(stored, "benchmark-password-1"), range(logins))
+                )
+            seconds = time.perf_counter() - started
+        finally:
+            hasher.shutdown()
+
+        if not all(results):
+            raise click.ClickException(f"{hasher.method}: verification failed")
+        click.echo(
+            f"{hasher.method}: {logins / seconds:.1f} logins/sec "
+            f"({seconds / logins * 1000:.1f} ms each, {concurrency} threads, {workers} workers)"
+        )
+
+
+@stripe_cli.command("fake-server")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=12111, show_default=True)
+@click.option("--latency-ms", default=0, show_default=True, help="Delay added to every response.")
+@click.option("--fail-rate", default=0.0, show_default=True, help="Share of retryable 503s.")
+@click.option("--webhook-url", help="Where to deliver signed payment_intent.succeeded events.")
+@click.option("--webhook-secret", default="", help="Signing secret (STRIPE_WEBHOOK_SECRET).")
+def fake_server_command(host, port, latency_ms, fail_rate, webhook_url, webhook_secret):
+    """Serve an in-memory fake of the Stripe PaymentIntents API."""
+    from app.utils.fake_stripe import make_server
+
+    server = make_server(
+        host, port, latency=latency_ms / 1000, fail_rate=fail_rate,
+        webhook_url=webhook_url, webhook_secret=webhook_secret,
+    )
+    click.echo(f"fake Stripe on http://{host}:{server.server_port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@stripe_cli.command("drain-events")
+@click.option("--loop", is_flag=True, help="Keep polling until interrupted.")
+def drain_events_command(loop):
+    """Apply pending Stripe webhook events."""
+    from app.utils.stripe_events import event_worker
+
+    if loop:
+        click.echo(f"draining stripe events every {event_worker.interval}s (Ctrl+C to stop)")
+        try:
+            event_worker.run(current_app._get_current_object())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    click.echo(f"applied {event_worker.drain_all()} events")
+
+
+@stripe_cli.command("benchmark")
+@click.option("--requests", "total", default=200, show_default=True)
+@click.option("--concurrency", default=16, show_default=True)
+@click.option(
+    "--fake-latency-ms", type=int,
+    help="Run against a local fake server with this latency instead of STRIPE_API_BASE.",
+)
+@click.option("--fake-fail-rate", default=0.0, show_default=True)
+def stripe_benchmark_command(total, concurrency, fake_latency_ms, fake_fail_rate):
+    """Create payment intents through the gateway and report throughput."""
+    server = None
+    gateway = stripe_gateway
+    if fake_latency_ms is not None:
+        import threading
+
+        from app.utils.fake_stripe import make_server
+
+        server = make_server(port=0, latency=fake_latency_ms / 1000, fail_rate=fake_fail_rate)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        gateway = StripeGateway()
+        gateway.init_app(current_app)
+        gateway.secret_key = gateway.secret_key or "sk_test_fake"
+        gateway.api_base = f"http://127.0.0.1:{server.server_port}"
+
+    def create(i):
+        started = time.perf_counter()
+        try:
+            gateway.create_payment_intent(
+                1000, "kes", {"benchmark": "1"}, idempotency_key=f"benchmark-{time.time_ns()}-{i}"
+            )
+            ok = True
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as threads:
+            results = list(threads.map(create, range(total)))
+        seconds = time.perf_counter() - started
+    finally:
+        if server is not None:
+            gateway.close()
+            server.shutdown()
+
+    latencies = sorted(t for _ok, t in results)
+    failures = sum(1 for ok, _t in results if not ok)
+    click.echo(
+        f"{total / seconds:.1f} intents/sec, p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms, {failures} failed"
+    )
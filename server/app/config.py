@@ -5,6 +5,26 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///spacer.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Connection pool (ignored for in-memory SQLite); pre-ping and recycle drop
+    # connections the server closed while idle
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_POOL_LOG_INTERVAL = float(os.getenv("DB_POOL_LOG_INTERVAL", "60"))
+    # Postgres only: seconds to connect, per-statement limit in ms (0 = none)
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    # SQLite only
+    SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() in ("1", "true", "yes")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    # Comma-separated read replicas for GET requests; a replica that fails is
+    # re-probed every REPLICA_RETRY_INTERVAL seconds
+    DATABASE_REPLICA_URLS = os.getenv("DATABASE_REPLICA_URLS", "")
+    REPLICA_RETRY_INTERVAL = float(os.getenv("REPLICA_RETRY_INTERVAL", "10"))
+
     
     ENV = os.getenv("FLASK_ENV", "production")
 
@@ -19,6 +39,85 @@ class Config:
 
     
     STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
+    # Point at `flask stripe fake-server` for local runs and benchmarks
+    STRIPE_API_BASE = os.getenv("STRIPE_API_BASE", "https://api.stripe.com")
+    STRIPE_CONNECT_TIMEOUT = float(os.getenv("STRIPE_CONNECT_TIMEOUT", "2"))
+    STRIPE_READ_TIMEOUT = float(os.getenv("STRIPE_READ_TIMEOUT", "10"))
+    STRIPE_MAX_RETRIES = int(os.getenv("STRIPE_MAX_RETRIES", "2"))
+    STRIPE_POOL_SIZE = int(os.getenv("STRIPE_POOL_SIZE", "10"))
+
+    # Payments complete via POST /api/payments/webhook when set (else confirm polls Stripe)
+    STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
+    STRIPE_WEBHOOK_TOLERANCE = int(os.getenv("STRIPE_WEBHOOK_TOLERANCE", "300"))
+    # confirm asks Stripe directly once a payment's webhook is this many seconds overdue
+    STRIPE_CONFIRM_FALLBACK_AFTER = float(os.getenv("STRIPE_CONFIRM_FALLBACK_AFTER", "15"))
+    # In-process worker applying stored webhook events; disable when running
+    # `flask stripe drain-events --loop` as a separate process
+    STRIPE_EVENTS_WORKER = os.getenv("STRIPE_EVENTS_WORKER", "true").lower() in ("1", "true", "yes")
+    STRIPE_EVENTS_POLL_INTERVAL = float(os.getenv("STRIPE_EVENTS_POLL_INTERVAL", "5"))
+    STRIPE_EVENTS_BATCH_SIZE = int(os.getenv("STRIPE_EVENTS_BATCH_SIZE", "100"))
+    STRIPE_EVENTS_MAX_ATTEMPTS = int(os.getenv("STRIPE_EVENTS_MAX_ATTEMPTS", "10"))
+
+    
+    JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv("JWT_EXPIRES_SECONDS", "86400"))
 
     
-    JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv("JWT_EXPIRES_SECONDS", "86400"))
\ No newline at end of file
+    # When false, GET /api/spaces without ?limit/?cursor keeps returning the bare list.
+    SPACES_PAGINATE_BY_DEFAULT = os.getenv("SPACES_PAGINATE_BY_DEFAULT", "false").lower() in (
+        "1", "true", "yes"
+    )
+    SPACES_PAGE_SIZE = int(os.getenv("SPACES_PAGE_SIZE", "24"))
+
+    # Cache-Control max-age (seconds) for conditional GETs such as the space catalogue
+    HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+
+    # Per-worker cache of serialized space payloads (entries, seconds)
+    SPACES_CACHE_SIZE = int(os.getenv("SPACES_CACHE_SIZE", "256"))
+    SPACES_CACHE_TTL = int(os.getenv("SPACES_CACHE_TTL", "300"))
+
+    # Admin list endpoints page with ?limit= up to this maximum
+    ADMIN_PAGE_SIZE = int(os.getenv("ADMIN_PAGE_SIZE", "100"))
+    ADMIN_MAX_PAGE_SIZE = int(os.getenv("ADMIN_MAX_PAGE_SIZE", "500"))
+
+    # Dashboard aggregates are shared between admins for this many seconds
+    ADMIN_STATS_CACHE_TTL = int(os.getenv("ADMIN_STATS_CACHE_TTL", "30"))
+
+    # "sql" shares counters across workers via rate_limit_counters; "memory" is per process
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "sql")
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    RATE_LIMIT_MEMORY_MAX_KEYS = int(os.getenv("RATE_LIMIT_MEMORY_MAX_KEYS", "10000"))
+
+    # Werkzeug method string ("pbkdf2:sha256:1000000", "scrypt:32768:8:1") or, with
+    # argon2-cffi installed, "argon2[:time_cost:memory_cost:parallelism]".
+    # Older hashes are upgraded on the next successful login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+    # Hashing processes per app worker (0 = on the request thread), plus how many
+    # callers may queue for them, waiting up to PASSWORD_HASH_WAIT seconds, before a 503
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+    PASSWORD_HASH_WAIT = float(os.getenv("PASSWORD_HASH_WAIT", "5"))
+
+    # Firebase ID tokens are verified locally when the project id is known (also read
+    # from the service account credentials); verified tokens are cached (entries, seconds).
+    FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID", "")
+    FIREBASE_CERTS_URL = os.getenv("FIREBASE_CERTS_URL", "")
+    FIREBASE_TOKEN_CACHE_SIZE = int(os.getenv("FIREBASE_TOKEN_CACHE_SIZE", "1024"))
+    FIREBASE_TOKEN_CACHE_TTL = int(os.getenv("FIREBASE_TOKEN_CACHE_TTL", "300"))
+
+    # Per-worker cache of each user's token version / active flag checked on every
+    # authenticated request (entries, seconds); bounds how long other workers
+    # accept a token after the user is deactivated or changes role.
+    AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "4096"))
+    AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "30"))
+
+    # Server-Timing header with per-request query count / DB time; requests running one
+    # normalized statement more than SQL_REPEAT_THRESHOLD times are logged as N+1 suspects
+    SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "true").lower() in ("1", "true", "yes")
+    SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "10"))
+    SQL_LOG_REQUESTS = os.getenv("SQL_LOG_REQUESTS", "false").lower() in ("1", "true", "yes")
+
+    # /metrics: set METRICS_DIR (a directory shared by all workers, emptied on deploy)
+    # under gunicorn so every worker's series are aggregated; METRICS_TOKEN guards scrapes
+    METRICS_DIR = os.getenv("METRICS_DIR") or os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+    METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "1"))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
@@ -6,6 +6,9 @@ from .booking import Booking
 from .payment import Payment
 from .invoice import Invoice
 from .agreement_acceptance import AgreementAcceptance
+from .cache_version import CacheVersion
+from .rate_limit_counter import RateLimitCounter
+from .stripe_event import StripeEvent
 
 __all__ = [
     "db",
@@ -15,4 +18,7 @@ __all__ = [
     "Payment",
     "Invoice",
     "AgreementAcceptance",
+    "CacheVersion",
+    "RateLimitCounter",
+    "StripeEvent",
 ]
@@ -5,6 +5,10 @@ from app.extensions import db
 class Booking(db.Model):
     __tablename__ = "bookings"
 
+    __table_args__ = (
+        db.Index("ix_bookings_space_start_end", "space_id", "start_time", "end_time"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     
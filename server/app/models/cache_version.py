@@ -0,0 +1,15 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class CacheVersion(db.Model):
+    """
+    Generation counter per cached dataset. Writers bump it in the same
+    transaction as their change so every worker sees the new version on
+    its next read.
+    """
+    __tablename__ = "cache_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -5,6 +5,11 @@ from app.extensions import db
 class Invoice(db.Model):
     __tablename__ = "invoices"
 
+    __table_args__ = (
+        # GET /api/invoices: a user's invoices, newest first
+        db.Index("ix_invoices_user_issued", "user_id", "issued_at", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     booking_id = db.Column(
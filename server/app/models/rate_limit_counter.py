@@ -0,0 +1,14 @@
+from app.extensions import db
+
+
+class RateLimitCounter(db.Model):
+    """
+    Hit count of one rate-limit key in one fixed window; the shared backend
+    combines the current and previous windows into a sliding estimate.
+    """
+    __tablename__ = "rate_limit_counters"
+
+    key = db.Column(db.String(255), primary_key=True)
+    window = db.Column(db.BigInteger, primary_key=True)  # floor(epoch / window_seconds)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    expires_at = db.Column(db.BigInteger, nullable=False, index=True)  # epoch seconds
@@ -5,6 +5,12 @@ from app.extensions import db
 class Space(db.Model):
     __tablename__ = "spaces"
 
+    __table_args__ = (
+        db.Index("ix_spaces_active_name", "is_active", "name"),
+        db.Index("ix_spaces_active_price", "is_active", "price_per_hour"),
+        db.Index("ix_spaces_active_capacity", "is_active", "capacity"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
@@ -20,18 +26,26 @@ class Space(db.Model):
     max_capacity = db.Column(db.Integer)
     operating_hours = db.Column(db.String(100))
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "price_per_hour": self.price_per_hour,
-            "image_url": self.image_url,
-            "capacity": self.capacity,
-            "is_active": self.is_active,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "location": self.location,
-            "max_capacity": self.max_capacity,
-            "operating_hours": self.operating_hours,
-        }
+    SERIALIZED_FIELDS = (
+        "id",
+        "name",
+        "description",
+        "price_per_hour",
+        "image_url",
+        "capacity",
+        "is_active",
+        "created_at",
+        "updated_at",
+        "location",
+        "max_capacity",
+        "operating_hours",
+    )
+
+    def to_dict(self, fields=None):
+        data = {}
+        for field in fields or self.SERIALIZED_FIELDS:
+            value = getattr(self, field)
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            data[field] = value
+        return data
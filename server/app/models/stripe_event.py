@@ -0,0 +1,31 @@
+from datetime import datetime
+from sqlalchemy import text
+
+from app.extensions import db
+
+
+class StripeEvent(db.Model):
+    """
+    Raw Stripe webhook events, appended as received and applied later by
+    the event worker. event_id makes redeliveries no-ops.
+    """
+    __tablename__ = "stripe_events"
+
+    __table_args__ = (
+        db.Index(
+            "ix_stripe_events_pending",
+            "id",
+            postgresql_where=text("processed_at IS NULL"),
+            sqlite_where=text("processed_at IS NULL"),
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.String(255), nullable=False, unique=True)
+    type = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    received_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    processed_at = db.Column(db.DateTime, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
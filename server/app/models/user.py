@@ -1,8 +1,8 @@
 from datetime import datetime, timezone
-from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy import CheckConstraint
 
 from app.extensions import db
+from app.utils.passwords import password_hasher
 
 
 class User(db.Model):
@@ -21,18 +21,21 @@ class User(db.Model):
 
     role = db.Column(db.String(20), nullable=False, default="client") 
     is_active = db.Column(db.Boolean, nullable=False, default=True)
+    # bumped on role / is_active changes; tokens carrying an older value are rejected
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     created_at = db.Column(
         db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc)
     )
 
     def set_password(self, raw_password: str) -> None:
-        self.password_hash = generate_password_hash(
-            raw_password, method="pbkdf2:sha256", salt_length=16
-        )
+        self.password_hash = password_hasher.hash(raw_password)
 
     def check_password(self, raw_password: str) -> bool:
-        return check_password_hash(self.password_hash, raw_password)
+        return password_hasher.verify(self.password_hash, raw_password)
+
+    def password_needs_rehash(self) -> bool:
+        return password_hasher.needs_rehash(self.password_hash)
 
     def to_dict(self) -> dict:
         return {
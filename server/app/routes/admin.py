@@ -1,9 +1,22 @@
+import csv
+import io
 import re
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt
+from datetime import datetime, timedelta
+
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy import and_, case, func, or_, update
 
 from app.extensions import db
-from app.models import User, Space, Booking
+from app.models import User, Space, Booking, Invoice, Payment
+from app.routes.bookings import _latest_payments_subquery, _parse_dt
+from app.routes.spaces import _apply_space_filters, _like_pattern
+from app.utils.authz import invalidate_user, role_required
+from app.utils.availability import open_windows, parse_operating_hours
+from app.utils.cache import invalidate_spaces, stats_cache
+from app.utils.pagination import keyset_page, order_by_clauses, parse_limit
+from app.utils.space_import import IMPORT_FORMATS, import_spaces, parse_rows
+from app.utils.space_validation import validate_space_payload
+from app.utils.streaming import csv_response, iter_rows, ndjson_response, plain_value
 
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
@@ -11,13 +24,6 @@ admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 
-def _require_admin():
-    claims = get_jwt()
-    if claims.get("role") != "admin":
-        return jsonify({"error": "admin access required"}), 403
-    return None
-
-
 def _norm_email(value):
     return (value or "").strip().lower()
 
@@ -32,28 +38,109 @@ def _password_ok(password: str) -> bool:
     return True
 
 
+def _parse_bool(value):
+    """
+    "true"/"false" (and 1/0, yes/no) -> bool; None if absent, ValueError otherwise.
+    """
+    if value in (None, ""):
+        return None
+    lowered = str(value).strip().lower()
+    if lowered in ("1", "true", "yes"):
+        return True
+    if lowered in ("0", "false", "no"):
+        return False
+    raise ValueError(value)
+
+
+def _parse_id(value) -> int:
+    """
+    An int or a string of digits -> int; ValueError for anything else
+    (floats, bools, ...).
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    raise ValueError(value)
+
+
+def _admin_listing(key: str, query, sorts: dict, default_sort: str):
+    """
+    Shared body of the admin list endpoints: ?sort= picks a keyset order,
+    ?limit=/?cursor= page through it, and ?format=ndjson streams every
+    matching row instead of returning a page.
+    """
+    sort = request.args.get("sort") or default_sort
+    order = sorts.get(sort)
+    if order is None:
+        return jsonify({"error": f"sort must be one of: {sorted(sorts)}"}), 400
+
+    fmt = (request.args.get("format") or "json").lower()
+    if fmt == "ndjson":
+        rows = iter_rows(query.order_by(*order_by_clauses(order)))
+        return ndjson_response(rows, lambda row: row.to_dict(), filename=f"{key}.ndjson")
+    if fmt != "json":
+        return jsonify({"error": "format must be 'json' or 'ndjson'"}), 400
+
+    limit = parse_limit(
+        request.args.get("limit"),
+        default=current_app.config.get("ADMIN_PAGE_SIZE", 100),
+        maximum=current_app.config.get("ADMIN_MAX_PAGE_SIZE", 500),
+    )
+    if limit is None:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    try:
+        rows, next_cursor = keyset_page(
+            query, order, request.args.get("cursor"), limit, scope=sort
+        )
+    except ValueError:
+        return jsonify({"error": "invalid cursor"}), 400
+
+    return jsonify(
+        {key: [row.to_dict() for row in rows], "next_cursor": next_cursor, "limit": limit}
+    ), 200
+
+
 # -------------------------
 # Users
 # -------------------------
 
+_USER_SORTS = {
+    "newest": [(User.created_at, True), (User.id, True)],
+    "oldest": [(User.created_at, False), (User.id, False)],
+    "email": [(User.email, False), (User.id, False)],
+}
+
 @admin_bp.get("/users")
-@jwt_required()
+@role_required("admin")
 def list_users():
-    denied = _require_admin()
-    if denied:
-        return denied
+    query = User.query
+
+    role = (request.args.get("role") or "").strip().lower()
+    if role:
+        query = query.filter(User.role == role)
 
-    users = User.query.order_by(User.created_at.desc()).all()
-    return jsonify({"users": [u.to_dict() for u in users]}), 200
+    try:
+        is_active = _parse_bool(request.args.get("is_active"))
+    except ValueError:
+        return jsonify({"error": "is_active must be true or false"}), 400
+    if is_active is not None:
+        query = query.filter(User.is_active.is_(is_active))
+
+    q = (request.args.get("q") or "").strip()
+    if q:
+        pattern = _like_pattern(q)
+        query = query.filter(
+            or_(User.email.ilike(pattern, escape="\\"), User.full_name.ilike(pattern, escape="\\"))
+        )
+
+    return _admin_listing("users", query, _USER_SORTS, "newest")
 
 
 @admin_bp.post("/users")
-@jwt_required()
+@role_required("admin")
 def create_user():
-    denied = _require_admin()
-    if denied:
-        return denied
-
     data = request.get_json(silent=True) or {}
 
     email = _norm_email(data.get("email"))
@@ -93,18 +180,16 @@ def create_user():
 
 
 @admin_bp.patch("/users/<int:user_id>")
-@jwt_required()
+@role_required("admin")
 def update_user(user_id: int):
-    denied = _require_admin()
-    if denied:
-        return denied
-
     user = db.session.get(User, user_id)
     if not user:
         return jsonify({"error": "user not found"}), 404
 
     data = request.get_json(silent=True) or {}
 
+    access = (user.role, user.is_active)
+
     if "role" in data:
         role = (data.get("role") or "").strip().lower()
         if role not in ("admin", "client"):
@@ -120,103 +205,67 @@ def update_user(user_id: int):
         full_name = (data.get("full_name") or data.get("name") or "").strip()
         user.full_name = full_name or None
 
+    # revoke tokens issued under the old role / active state
+    if (user.role, user.is_active) != access:
+        user.token_version = (user.token_version or 0) + 1
+
     db.session.commit()
+    invalidate_user(user.id)
     return jsonify({"user": user.to_dict()}), 200
 
 
 
 
+# Space.created_at is nullable, so "newest" keys on id instead
+_SPACE_SORTS = {
+    "newest": [(Space.id, True)],
+    "oldest": [(Space.id, False)],
+    "name": [(Space.name, False), (Space.id, False)],
+    "price_asc": [(Space.price_per_hour, False), (Space.id, False)],
+    "price_desc": [(Space.price_per_hour, True), (Space.id, False)],
+}
+
+
 @admin_bp.get("/spaces")
-@jwt_required()
+@role_required("admin")
 def list_spaces():
-    denied = _require_admin()
-    if denied:
-        return denied
+    query = Space.query
+
+    try:
+        is_active = _parse_bool(request.args.get("is_active"))
+    except ValueError:
+        return jsonify({"error": "is_active must be true or false"}), 400
+    if is_active is not None:
+        query = query.filter(Space.is_active.is_(is_active))
+
+    query, error = _apply_space_filters(query, request.args)
+    if error:
+        return jsonify({"error": error}), 400
 
-    spaces = Space.query.order_by(Space.created_at.desc()).all()
-    return jsonify({"spaces": [s.to_dict() for s in spaces]}), 200
+    return _admin_listing("spaces", query, _SPACE_SORTS, "newest")
 
 
 @admin_bp.post("/spaces")
-@jwt_required()
+@role_required("admin")
 def create_space():
-    denied = _require_admin()
-    if denied:
-        return denied
-
     data = request.get_json(silent=True) or {}
 
-    name = (data.get("name") or "").strip()
-    description = (data.get("description") or "").strip()
-    location = (data.get("location") or "").strip() or None
-    operating_hours = (data.get("operating_hours") or "").strip() or None
-    image_url = (data.get("image_url") or "").strip() or None
-
-    price_per_hour = data.get("price_per_hour")
-    capacity = data.get("capacity")
-    max_capacity = data.get("max_capacity")
-
-    is_active = data.get("is_active", True)
-    if not isinstance(is_active, bool):
-        return jsonify({"error": "is_active must be boolean"}), 400
-
-    if not name:
-        return jsonify({"error": "name is required"}), 400
-    if not description:
-        return jsonify({"error": "description is required"}), 400
-
-    try:
-        price_per_hour = int(price_per_hour)
-    except Exception:
-        return jsonify({"error": "price_per_hour must be an integer"}), 400
-    if price_per_hour <= 0:
-        return jsonify({"error": "price_per_hour must be > 0"}), 400
+    values, error = validate_space_payload(data)
+    if error:
+        return jsonify({"error": error}), 400
 
-    try:
-        capacity = int(capacity)
-    except Exception:
-        return jsonify({"error": "capacity must be an integer"}), 400
-    if capacity <= 0:
-        return jsonify({"error": "capacity must be > 0"}), 400
-
-   
-    if max_capacity is not None and max_capacity != "":
-        try:
-            max_capacity = int(max_capacity)
-        except Exception:
-            return jsonify({"error": "max_capacity must be an integer"}), 400
-        if max_capacity <= 0:
-            return jsonify({"error": "max_capacity must be > 0"}), 400
-        if max_capacity < capacity:
-            return jsonify({"error": "max_capacity cannot be less than capacity"}), 400
-    else:
-        max_capacity = None
-
-    space = Space(
-        name=name,
-        description=description,
-        location=location,
-        price_per_hour=price_per_hour,
-        capacity=capacity,
-        max_capacity=max_capacity,
-        operating_hours=operating_hours,
-        image_url=image_url,
-        is_active=is_active,
-    )
+    space = Space(**values)
 
     db.session.add(space)
+    invalidate_spaces()
     db.session.commit()
 
     return jsonify({"space": space.to_dict()}), 201
 
 
 @admin_bp.patch("/spaces/<int:space_id>")
-@jwt_required()
+@role_required("admin")
 def update_space(space_id: int):
-    denied = _require_admin()
-    if denied:
-        return denied
-
     space = db.session.get(Space, space_id)
     if not space:
         return jsonify({"error": "space not found"}), 404
@@ -228,33 +277,187 @@ def update_space(space_id: int):
             return jsonify({"error": "is_active must be boolean"}), 400
         space.is_active = data["is_active"]
 
+    invalidate_spaces()
     db.session.commit()
     return jsonify({"space": space.to_dict()}), 200
 
 
 
 
+@admin_bp.post("/spaces/import")
+@role_required("admin")
+def import_spaces_upload():
+    """
+    Bulk import from a multipart "file" upload or a raw text/csv or
+    application/x-ndjson body. ?format= overrides the detected format;
+    ?dry_run=true validates without inserting.
+    """
+    upload = request.files.get("file")
+    if upload is not None:
+        stream, name, mimetype = upload.stream, upload.filename or "", upload.mimetype
+    else:
+        stream, name, mimetype = request.stream, "", request.mimetype
+
+    fmt = (request.args.get("format") or "").lower()
+    if not fmt:
+        fmt = "csv" if name.lower().endswith(".csv") or mimetype == "text/csv" else "ndjson"
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {list(IMPORT_FORMATS)}"}), 400
+
+    try:
+        dry_run = bool(_parse_bool(request.args.get("dry_run")))
+    except ValueError:
+        return jsonify({"error": "dry_run must be true or false"}), 400
+
+    lines = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    try:
+        report = import_spaces(parse_rows(lines, fmt), dry_run=dry_run)
+    except (UnicodeDecodeError, csv.Error):
+        db.session.rollback()
+        return jsonify({"error": "file could not be parsed"}), 400
+
+    return jsonify(report), 200
+
+
+# "delete" is the same soft delete as DELETE /admin/spaces/<id>
+_BULK_SPACE_ACTIONS = {"activate": True, "deactivate": False, "delete": False}
+_BULK_MAX_IDS = 1000
+
+
+@admin_bp.post("/spaces/bulk")
+@role_required("admin")
+def bulk_spaces():
+    """
+    {"action": "activate"|"deactivate"|"delete", "ids": [...]} or
+    {"action": ..., "filter": {<same keys as GET /admin/spaces>}}
+
+    Applies the change with a single UPDATE ... WHERE id IN (...) and
+    reports an outcome per id: updated | unchanged | not_found.
+    """
+    data = request.get_json(silent=True) or {}
+
+    action = (data.get("action") or "").strip().lower()
+    if action not in _BULK_SPACE_ACTIONS:
+        return jsonify({"error": f"action must be one of: {sorted(_BULK_SPACE_ACTIONS)}"}), 400
+    target = _BULK_SPACE_ACTIONS[action]
+
+    ids = data.get("ids")
+    filters = data.get("filter")
+    if (ids is None) == (filters is None):
+        return jsonify({"error": "provide exactly one of ids or filter"}), 400
+
+    if ids is not None:
+        if not isinstance(ids, list) or not ids:
+            return jsonify({"error": "ids must be a non-empty list"}), 400
+        if len(ids) > _BULK_MAX_IDS:
+            return jsonify({"error": f"at most {_BULK_MAX_IDS} spaces per bulk operation"}), 400
+        try:
+            ids = list(dict.fromkeys(_parse_id(i) for i in ids))
+        except ValueError:
+            return jsonify({"error": "ids must be integers"}), 400
+        query = Space.query.filter(Space.id.in_(ids))
+    else:
+        if not isinstance(filters, dict):
+            return jsonify({"error": "filter must be an object"}), 400
+        query = Space.query
+        try:
+            is_active = _parse_bool(filters.get("is_active"))
+        except ValueError:
+            return jsonify({"error": "is_active must be true or false"}), 400
+        if is_active is not None:
+            query = query.filter(Space.is_active.is_(is_active))
+        query, error = _apply_space_filters(query, filters)
+        if error:
+            return jsonify({"error": error}), 400
+
+    current = dict(
+        query.with_entities(Space.id, Space.is_active).order_by(Space.id).limit(_BULK_MAX_IDS + 1)
+    )
+    if len(current) > _BULK_MAX_IDS:
+        return jsonify({"error": f"at most {_BULK_MAX_IDS} spaces per bulk operation"}), 400
+    if ids is None:
+        ids = list(current)
+
+    to_change = [i for i, active in current.items() if bool(active) != target]
+
+    if to_change:
+        db.session.execute(
+            update(Space)
+            .where(Space.id.in_(to_change))
+            .values(is_active=target, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        invalidate_spaces()
+    db.session.commit()
+
+    changed = set(to_change)
+    results = []
+    for space_id in ids:
+        if space_id not in current:
+            outcome = "not_found"
+        elif space_id in changed:
+            outcome = "updated"
+        else:
+            outcome = "unchanged"
+        results.append({"id": space_id, "outcome": outcome})
+
+    return jsonify(
+        {
+            "action": action,
+            "updated": len(changed),
+            "unchanged": sum(1 for r in results if r["outcome"] == "unchanged"),
+            "not_found": sum(1 for r in results if r["outcome"] == "not_found"),
+            "results": results,
+        }
+    ), 200
+
+
 _ALLOWED_BOOKING_STATUSES = {"confirmed", "cancelled", "paid", "unpaid", "pending"}
 
+_BOOKING_SORTS = {
+    "newest": [(Booking.created_at, True), (Booking.id, True)],
+    "oldest": [(Booking.created_at, False), (Booking.id, False)],
+    "start_time": [(Booking.start_time, False), (Booking.id, False)],
+    "start_time_desc": [(Booking.start_time, True), (Booking.id, True)],
+}
+
 
 @admin_bp.get("/bookings")
-@jwt_required()
+@role_required("admin")
 def list_bookings():
-    denied = _require_admin()
-    if denied:
-        return denied
+    query = Booking.query
+
+    status = (request.args.get("status") or "").strip().lower()
+    if status:
+        query = query.filter(Booking.status == status)
 
-    bookings = Booking.query.order_by(Booking.created_at.desc()).all()
-    return jsonify({"bookings": [b.to_dict() for b in bookings]}), 200
+    for arg, column in (("space_id", Booking.space_id), ("user_id", Booking.user_id)):
+        raw = request.args.get(arg)
+        if raw in (None, ""):
+            continue
+        try:
+            query = query.filter(column == int(raw))
+        except ValueError:
+            return jsonify({"error": f"{arg} must be an integer"}), 400
+
+    # date range selects bookings starting in [from, to)
+    for arg in ("from", "to"):
+        raw = request.args.get(arg)
+        if raw and _parse_dt(raw) is None:
+            return jsonify({"error": f"{arg} must be an ISO datetime"}), 400
+    start = _parse_dt(request.args.get("from"))
+    end = _parse_dt(request.args.get("to"))
+    if start:
+        query = query.filter(Booking.start_time >= start)
+    if end:
+        query = query.filter(Booking.start_time < end)
+
+    return _admin_listing("bookings", query, _BOOKING_SORTS, "newest")
 
 
 @admin_bp.patch("/bookings/<int:booking_id>")
-@jwt_required()
+@role_required("admin")
 def update_booking(booking_id: int):
-    denied = _require_admin()
-    if denied:
-        return denied
-
     booking = db.session.get(Booking, booking_id)
     if not booking:
         return jsonify({"error": "booking not found"}), 404
@@ -268,4 +471,271 @@ def update_booking(booking_id: int):
         booking.status = status
 
     db.session.commit()
-    return jsonify({"booking": booking.to_dict()}), 200
\ No newline at end of file
+    return jsonify({"booking": booking.to_dict()}), 200
+
+
+# -------------------------
+# Stats
+# -------------------------
+
+_STATS_MAX_DAYS = 366
+
+
+def _month_bucket(column):
+    if db.session.get_bind().dialect.name == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+
+def _count_by(column, model):
+    return dict(db.session.query(column, func.count(model.id)).group_by(column).all())
+
+
+def _dashboard_stats(days: int, top: int) -> dict:
+    now = datetime.utcnow()
+    since = now - timedelta(days=days)
+
+    users_total, users_active, users_admins = db.session.query(
+        func.count(User.id),
+        func.sum(case((User.is_active.is_(True), 1), else_=0)),
+        func.sum(case((User.role == "admin", 1), else_=0)),
+    ).one()
+
+    spaces_total, spaces_active = db.session.query(
+        func.count(Space.id),
+        func.sum(case((Space.is_active.is_(True), 1), else_=0)),
+    ).one()
+
+    bookings_by_status = _count_by(Booking.status, Booking)
+
+    day = func.date(Booking.created_at)
+    by_day = (
+        db.session.query(day, func.count(Booking.id))
+        .filter(Booking.created_at >= since)
+        .group_by(day)
+        .order_by(day)
+        .all()
+    )
+
+    month = _month_bucket(Invoice.issued_at)
+    revenue_rows = (
+        db.session.query(
+            Space.id, Space.name, month, func.sum(Invoice.amount_minor), func.count(Invoice.id)
+        )
+        .join(Booking, Booking.id == Invoice.booking_id)
+        .join(Space, Space.id == Booking.space_id)
+        .filter(Invoice.status == "paid", Invoice.issued_at >= since)
+        .group_by(Space.id, Space.name, month)
+        .order_by(month, Space.id)
+        .all()
+    )
+
+    # booked minutes per space in the window, set against its opening hours
+    booked_rows = (
+        db.session.query(
+            Space.id, Space.name, Space.operating_hours, func.sum(Booking.duration)
+        )
+        .join(Booking, Booking.space_id == Space.id)
+        .filter(
+            Booking.status != "cancelled",
+            Booking.start_time >= since,
+            Booking.start_time < now,
+        )
+        .group_by(Space.id, Space.name, Space.operating_hours)
+        .all()
+    )
+    utilization = []
+    for space_id, name, operating_hours, booked in booked_rows:
+        windows = open_windows(since, now, parse_operating_hours(operating_hours))
+        open_minutes = sum(int((end - start).total_seconds() // 60) for start, end in windows)
+        booked = int(booked or 0)
+        ratio = min(booked / open_minutes, 1.0) if open_minutes else 0.0
+        utilization.append(
+            {
+                "space_id": space_id,
+                "name": name,
+                "booked_minutes": booked,
+                "open_minutes": open_minutes,
+                "utilization": round(ratio, 4),
+            }
+        )
+    utilization.sort(key=lambda row: (-row["utilization"], row["space_id"]))
+
+    return {
+        "generated_at": now.isoformat(),
+        "window_days": days,
+        "users": {
+            "total": users_total,
+            "active": int(users_active or 0),
+            "admins": int(users_admins or 0),
+        },
+        "spaces": {
+            "total": spaces_total,
+            "active": int(spaces_active or 0),
+            "inactive": spaces_total - int(spaces_active or 0),
+        },
+        "bookings": {
+            "total": sum(bookings_by_status.values()),
+            "by_status": bookings_by_status,
+            "by_day": [{"day": str(d), "count": c} for d, c in by_day],
+        },
+        "revenue": {
+            "total_minor": int(sum(row[3] or 0 for row in revenue_rows)),
+            "by_space_month": [
+                {
+                    "space_id": space_id,
+                    "space_name": name,
+                    "month": bucket,
+                    "amount_minor": int(amount or 0),
+                    "invoices": invoices,
+                }
+                for space_id, name, bucket, amount, invoices in revenue_rows
+            ],
+        },
+        "top_spaces": utilization[:top],
+    }
+
+
+@admin_bp.get("/stats")
+@role_required("admin")
+def dashboard_stats():
+    try:
+        days = int(request.args.get("days", 30))
+        top = int(request.args.get("top", 5))
+    except ValueError:
+        return jsonify({"error": "days and top must be integers"}), 400
+    if not 1 <= days <= _STATS_MAX_DAYS or not 1 <= top <= 50:
+        return jsonify({"error": f"days must be 1-{_STATS_MAX_DAYS} and top 1-50"}), 400
+
+    stats = stats_cache.get_or_build(("stats", days, top), None, lambda: _dashboard_stats(days, top))
+    return jsonify(stats), 200
+
+
+# -------------------------
+# Exports
+# -------------------------
+
+def _bookings_export(start, end):
+    latest = _latest_payments_subquery()
+    query = (
+        db.session.query(
+            Booking.id.label("booking_id"),
+            Booking.created_at,
+            Booking.start_time,
+            Booking.end_time,
+            Booking.duration,
+            Booking.total_cost,
+            Booking.status,
+            Space.id.label("space_id"),
+            Space.name.label("space_name"),
+            User.id.label("user_id"),
+            User.email.label("user_email"),
+            latest.c.status.label("payment_status"),
+            latest.c.payment_intent_id,
+            Invoice.id.label("invoice_id"),
+            Invoice.amount_minor.label("invoice_amount_minor"),
+        )
+        .join(Space, Space.id == Booking.space_id)
+        .join(User, User.id == Booking.user_id)
+        .outerjoin(latest, and_(latest.c.booking_id == Booking.id, latest.c.rn == 1))
+        .outerjoin(Invoice, Invoice.booking_id == Booking.id)
+        .order_by(Booking.id)
+    )
+    return _in_range(query, Booking.start_time, start, end)
+
+
+def _payments_export(start, end):
+    query = (
+        db.session.query(
+            Payment.id.label("payment_id"),
+            Payment.created_at,
+            Payment.status,
+            Payment.amount_minor,
+            Payment.currency,
+            Payment.stripe_payment_intent_id,
+            Payment.invoice_id,
+            Booking.id.label("booking_id"),
+            Space.id.label("space_id"),
+            Space.name.label("space_name"),
+            User.id.label("user_id"),
+            User.email.label("user_email"),
+        )
+        .join(Booking, Booking.id == Payment.booking_id)
+        .join(Space, Space.id == Booking.space_id)
+        .join(User, User.id == Payment.user_id)
+        .order_by(Payment.id)
+    )
+    return _in_range(query, Payment.created_at, start, end)
+
+
+def _invoices_export(start, end):
+    query = (
+        db.session.query(
+            Invoice.id.label("invoice_id"),
+            Invoice.issued_at,
+            Invoice.status,
+            Invoice.amount_minor,
+            Invoice.currency,
+            Booking.id.label("booking_id"),
+            Booking.start_time,
+            Booking.end_time,
+            Space.id.label("space_id"),
+            Space.name.label("space_name"),
+            User.id.label("user_id"),
+            User.email.label("user_email"),
+            Payment.stripe_payment_intent_id,
+        )
+        .join(Booking, Booking.id == Invoice.booking_id)
+        .join(Space, Space.id == Booking.space_id)
+        .join(User, User.id == Invoice.user_id)
+        .outerjoin(Payment, Payment.invoice_id == Invoice.id)
+        .order_by(Invoice.id)
+    )
+    return _in_range(query, Invoice.issued_at, start, end)
+
+
+def _in_range(query, column, start, end):
+    if start:
+        query = query.filter(column >= start)
+    if end:
+        query = query.filter(column < end)
+    return query
+
+
+_EXPORTS = {
+    "bookings": _bookings_export,
+    "payments": _payments_export,
+    "invoices": _invoices_export,
+}
+
+
+@admin_bp.get("/export/<dataset>")
+@role_required("admin")
+def export_dataset(dataset: str):
+    """
+    Streams bookings/payments/invoices in [from, to) as CSV or NDJSON,
+    gzip-compressed when the client accepts it.
+    """
+    build = _EXPORTS.get(dataset)
+    if build is None:
+        return jsonify({"error": f"dataset must be one of: {sorted(_EXPORTS)}"}), 404
+
+    fmt = (request.args.get("format") or "csv").lower()
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "format must be 'csv' or 'ndjson'"}), 400
+
+    for arg in ("from", "to"):
+        raw = request.args.get(arg)
+        if raw and _parse_dt(raw) is None:
+            return jsonify({"error": f"{arg} must be an ISO datetime"}), 400
+
+    query = build(_parse_dt(request.args.get("from")), _parse_dt(request.args.get("to")))
+    columns = [c["name"] for c in query.column_descriptions]
+    rows = iter_rows(query)
+    filename = f"{dataset}.{fmt}"
+
+    if fmt == "csv":
+        return csv_response(columns, rows, filename=filename)
+    return ndjson_response(
+        rows, lambda row: {k: plain_value(v) for k, v in row._mapping.items()}, filename=filename
+    )
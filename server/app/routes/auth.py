@@ -1,18 +1,19 @@
 import re
-import time
 import os
 import json
 import secrets
 import firebase_admin
+import requests
 from firebase_admin import credentials, auth as fb_auth
 
-from collections import deque
-
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 
 from app.extensions import db
 from app.models import User
+from app.utils.authz import get_current_user, issue_token
+from app.utils.firebase_tokens import firebase_verifier
+from app.utils.ratelimit import rate_limit
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
 
@@ -43,36 +44,9 @@ def _norm_email(value: str | None) -> str:
     return (value or "").strip().lower()
 
 
-def _client_ip() -> str:
-    forwarded_for = request.headers.get("X-Forwarded-For", "")
-    if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
-    return request.remote_addr or "unknown"
-
-
-_RATE_LIMITS = {
-    "register": {"count": 5, "window": 60 * 60},
-    "login": {"count": 10, "window": 15 * 60},
-}
-_RATE_BUCKETS: dict[tuple[str, str, str], deque[float]] = {}
-
-
-def _rate_limited(action: str, email: str) -> tuple[bool, int]:
-    limit = _RATE_LIMITS[action]
-    key = (action, _client_ip(), email or "unknown")
-    now = time.monotonic()
-    cutoff = now - limit["window"]
-
-    bucket = _RATE_BUCKETS.setdefault(key, deque())
-    while bucket and bucket[0] < cutoff:
-        bucket.popleft()
-
-    if len(bucket) >= limit["count"]:
-        retry_after = int(limit["window"] - (now - bucket[0]))
-        return True, max(retry_after, 1)
-
-    bucket.append(now)
-    return False, 0
+def _email_key() -> str:
+    data = request.get_json(silent=True) or {}
+    return _norm_email(data.get("email"))
 
 
 def _password_ok(password: str) -> bool:
@@ -85,7 +59,24 @@ def _password_ok(password: str) -> bool:
     return True
 
 
+# Only requests that pass validation are real attempts and count towards
+# the rate limit; malformed ones get their 400 without using up the quota.
+
+def _is_register_attempt() -> bool:
+    data = request.get_json(silent=True) or {}
+    password = data.get("password") or ""
+    return bool(EMAIL_RE.match(_email_key())) and isinstance(password, str) and _password_ok(password)
+
+
+def _is_login_attempt() -> bool:
+    data = request.get_json(silent=True) or {}
+    return bool(EMAIL_RE.match(_email_key())) and bool(data.get("password"))
+
+
 @auth_bp.post("/register")
+@rate_limit(
+    "register", count=5, window=60 * 60, key_func=_email_key, counts=_is_register_attempt
+)
 def register():
     data = request.get_json(silent=True) or {}
 
@@ -104,14 +95,6 @@ def register():
             {"error": "password must be at least 8 characters and include letters and numbers"}
         ), 400
 
-    limited, retry_after = _rate_limited("register", email)
-    if limited:
-        return (
-            jsonify({"error": "too many attempts, try again later"}),
-            429,
-            {"Retry-After": str(retry_after)},
-        )
-
     if User.query.filter_by(email=email).first():
         return jsonify({"error": "registration failed"}), 400
 
@@ -121,11 +104,14 @@ def register():
     db.session.add(user)
     db.session.commit()
 
-    token = create_access_token(identity=str(user.id), additional_claims={"role": user.role})
+    token = issue_token(user)
     return jsonify({"token": token, "user": user.to_dict()}), 201
 
 
 @auth_bp.post("/login")
+@rate_limit(
+    "login", count=10, window=15 * 60, key_func=_email_key, counts=_is_login_attempt
+)
 def login():
     data = request.get_json(silent=True) or {}
 
@@ -138,14 +124,6 @@ def login():
     if not EMAIL_RE.match(email):
         return jsonify({"error": "invalid email"}), 400
 
-    limited, retry_after = _rate_limited("login", email)
-    if limited:
-        return (
-            jsonify({"error": "too many attempts, try again later"}),
-            429,
-            {"Retry-After": str(retry_after)},
-        )
-
     user = User.query.filter_by(email=email).first()
     if not user or not user.check_password(password):
         return jsonify({"error": "invalid credentials"}), 401
@@ -153,21 +131,19 @@ def login():
     if not user.is_active:
         return jsonify({"error": "invalid credentials"}), 401
 
-    token = create_access_token(identity=str(user.id), additional_claims={"role": user.role})
+    # upgrade hashes left behind by an older PASSWORD_HASH_METHOD
+    if user.password_needs_rehash():
+        user.set_password(password)
+        db.session.commit()
+
+    token = issue_token(user)
     return jsonify({"token": token, "user": user.to_dict()}), 200
 
 
 @auth_bp.get("/me")
 @jwt_required()
 def me():
-    user_id = get_jwt_identity()
-
-    try:
-        uid = int(user_id)
-    except (TypeError, ValueError):
-        return jsonify({"error": "invalid token identity"}), 401
-
-    user = db.session.get(User, uid)
+    user = get_current_user()
     if not user:
         return jsonify({"error": "user not found"}), 404
 
@@ -177,7 +153,9 @@ def me():
 def firebase_login():
     """
     Frontend sends: { "id_token": "<firebase_id_token>" }
-    Backend verifies with Firebase Admin SDK and returns your JWT + user payload.
+    Backend verifies it (locally against cached Google certificates when the
+    Firebase project id is known, else with the Admin SDK) and returns your
+    JWT + user payload.
     """
     data = request.get_json(silent=True) or {}
     id_token = data.get("id_token")
@@ -186,8 +164,13 @@ def firebase_login():
         return jsonify({"error": "id_token is required"}), 400
 
     try:
-        _init_firebase()
-        decoded = fb_auth.verify_id_token(id_token)
+        if firebase_verifier.configured:
+            decoded = firebase_verifier.verify(id_token)
+        else:
+            _init_firebase()
+            decoded = fb_auth.verify_id_token(id_token)
+    except requests.RequestException:
+        return jsonify({"error": "could not fetch firebase signing keys"}), 503
     except Exception:
         return jsonify({"error": "invalid firebase token"}), 401
 
@@ -216,5 +199,5 @@ def firebase_login():
     if not user.is_active:
         return jsonify({"error": "account disabled"}), 403
 
-    token = create_access_token(identity=str(user.id), additional_claims={"role": user.role})
+    token = issue_token(user)
     return jsonify({"token": token, "user": user.to_dict()}), 200
@@ -1,10 +1,20 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.exc import IntegrityError
 
 from app.extensions import db
 from app.models import Booking, Space, Payment, Invoice
+from app.utils.availability import (
+    merge_intervals,
+    open_windows,
+    overlap_checker,
+    parse_operating_hours,
+    parse_slot,
+    split_slots,
+    subtract_intervals,
+)
 
 bookings_bp = Blueprint("bookings", __name__, url_prefix="/api/bookings")
 
@@ -17,44 +27,155 @@ def _as_int(value):
 
 
 def _parse_dt(value: str | None) -> datetime | None:
+    """
+    Parses an ISO timestamp. Values with an offset ("Z", "+03:00") are
+    converted to naive UTC, which is how booking times are stored, so they
+    compare with database values.
+    """
     if not value:
         return None
     try:
-        return datetime.fromisoformat(value)
+        parsed = datetime.fromisoformat(value)
     except Exception:
         return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+CALENDAR_MAX_DAYS = 62
+CALENDAR_MIN_SLOT = 5
+
+
+def _blocking(space_id, start_time: datetime, end_time: datetime):
+    """
+    Filter for bookings of a space that overlap [start_time, end_time),
+    whatever their status. Served by ix_bookings_space_start_end.
+    space_id may be a column (e.g. Space.id) to correlate an EXISTS.
+    """
+    return and_(
+        Booking.space_id == space_id,
+        Booking.start_time < end_time,
+        Booking.end_time > start_time,
+    )
+
+
+# pg_advisory_xact_lock(classid, objid) namespace for per-space booking locks
+_BOOKING_LOCK_NS = 4201
+_OVERLAP_CONSTRAINT = "ex_bookings_no_overlap"
+
+
+def _lock_space_bookings(space_id: int) -> None:
+    """
+    Serializes booking inserts for one space until the transaction ends, so
+    the overlap check and the INSERT cannot interleave with another request.
+    On Postgres ex_bookings_no_overlap is the real guarantee; the lock just
+    turns most races into a clean overlap check instead of a constraint error.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.session.execute(
+            text("SELECT pg_advisory_xact_lock(:ns, :key)"),
+            {"ns": _BOOKING_LOCK_NS, "key": space_id},
+        )
+    elif dialect == "sqlite":
+        # SQLite has a single writer: take the write lock before reading,
+        # which is what BEGIN IMMEDIATE would do.
+        db.session.execute(text("UPDATE spaces SET id = id WHERE id = :id"), {"id": space_id})
+    else:
+        db.session.execute(select(Space.id).where(Space.id == space_id).with_for_update())
+
+
+def _booking_cost(space: Space, start_time: datetime, end_time: datetime) -> tuple[int, int]:
+    """
+    Returns (duration_minutes, total_cost) for a booking of space.
+    """
+    duration_minutes = int((end_time - start_time).total_seconds() // 60)
+    hours = duration_minutes / 60.0
+    total_cost = int(round(float(space.price_per_hour) * hours))
+    return duration_minutes, total_cost
+
+
+def _is_overlap_violation(exc: IntegrityError) -> bool:
+    # 23P01 = exclusion_violation
+    return (
+        getattr(exc.orig, "pgcode", None) == "23P01"
+        or _OVERLAP_CONSTRAINT in str(exc.orig)
+    )
 
 
 def overlap_exists(space_id: int, start_time: datetime, end_time: datetime) -> bool:
     return (
-        Booking.query.filter(
-            Booking.space_id == space_id,
-            and_(Booking.start_time < end_time, Booking.end_time > start_time),
-        ).first()
+        Booking.query.filter(_blocking(space_id, start_time, end_time)).first()
         is not None
     )
 
 
+def _latest_payments_subquery(booking_ids=None):
+    """
+    Payments ranked per booking, newest first; join on rn == 1 for the
+    latest one. Optionally restricted to booking_ids.
+    """
+    query = db.session.query(
+        Payment.booking_id.label("booking_id"),
+        Payment.status.label("status"),
+        Payment.stripe_payment_intent_id.label("payment_intent_id"),
+        func.row_number()
+        .over(
+            partition_by=Payment.booking_id,
+            order_by=(Payment.created_at.desc(), Payment.id.desc()),
+        )
+        .label("rn"),
+    )
+    if booking_ids is not None:
+        query = query.filter(Payment.booking_id.in_(booking_ids))
+    return query.subquery()
+
+
+def _payment_info_for_bookings(booking_ids) -> dict[int, tuple[str, int | None]]:
+    """
+    Batch version of _payment_info_for_booking.
+    Returns {booking_id: (payment_status, invoice_id)} using two queries
+    regardless of how many bookings are passed in.
+    """
+    ids = {int(i) for i in booking_ids}
+    if not ids:
+        return {}
+
+    info: dict[int, tuple[str, int | None]] = {i: ("unpaid", None) for i in ids}
+
+    invoice_rows = (
+        db.session.query(Invoice.booking_id, func.max(Invoice.id))
+        .filter(Invoice.booking_id.in_(ids))
+        .group_by(Invoice.booking_id)
+        .all()
+    )
+    for booking_id, invoice_id in invoice_rows:
+        info[booking_id] = ("paid", invoice_id)
+
+    pending = [i for i in ids if info[i][1] is None]
+    if not pending:
+        return info
+
+    ranked = _latest_payments_subquery(pending)
+    payment_rows = (
+        db.session.query(ranked.c.booking_id, ranked.c.status)
+        .filter(ranked.c.rn == 1)
+        .all()
+    )
+    for booking_id, status in payment_rows:
+        info[booking_id] = (status, None)
+
+    return info
+
+
 def _payment_info_for_booking(booking_id: int) -> tuple[str, int | None]:
     """
     Returns (payment_status, invoice_id)
       - payment_status: "paid" | "unpaid" | latest Payment.status
       - invoice_id: Invoice.id if exists else None
     """
-    inv = (
-        Invoice.query.filter_by(booking_id=booking_id)
-        .order_by(Invoice.id.desc())
-        .first()
-    )
-    if inv:
-        return "paid", inv.id
-
-    payment = (
-        Payment.query.filter_by(booking_id=booking_id)
-        .order_by(Payment.created_at.desc())
-        .first()
-    )
-    return (payment.status if payment else "unpaid"), None
+    return _payment_info_for_bookings([booking_id])[int(booking_id)]
 
 
 @bookings_bp.get("/me")
@@ -72,9 +193,11 @@ def my_bookings():
         .all()
     )
 
+    payment_info = _payment_info_for_bookings(b.id for b, _s in rows)
+
     bookings = []
     for b, s in rows:
-        payment_status, invoice_id = _payment_info_for_booking(b.id)
+        payment_status, invoice_id = payment_info[b.id]
         bookings.append(
             {
                 "id": b.id,
@@ -118,6 +241,58 @@ def check_availability(space_id: int):
     return jsonify({"available": available}), 200
 
 
+def _interval_list(intervals):
+    return [{"start": s.isoformat(), "end": e.isoformat()} for s, e in intervals]
+
+
+@bookings_bp.get("/space/<int:space_id>/calendar")
+@jwt_required(optional=True)
+def space_calendar(space_id: int):
+    start = _parse_dt(request.args.get("from"))
+    end = _parse_dt(request.args.get("to"))
+
+    if not start or not end:
+        return jsonify({"error": "from and to are required (ISO format)"}), 400
+
+    if start >= end:
+        return jsonify({"error": "to must be after from"}), 400
+
+    if (end - start).days > CALENDAR_MAX_DAYS:
+        return jsonify({"error": f"range cannot exceed {CALENDAR_MAX_DAYS} days"}), 400
+
+    slot_minutes = parse_slot(request.args.get("slot"))
+    if slot_minutes is None or not CALENDAR_MIN_SLOT <= slot_minutes <= 24 * 60:
+        return jsonify({"error": "slot must be like 30m or 1h (5m to 24h)"}), 400
+
+    space = db.session.get(Space, space_id)
+    if not space or not space.is_active:
+        return jsonify({"error": "Space not found"}), 404
+
+    rows = (
+        db.session.query(Booking.start_time, Booking.end_time)
+        .filter(_blocking(space_id, start, end))
+        .order_by(Booking.start_time)
+        .all()
+    )
+    busy = merge_intervals((max(s, start), min(e, end)) for s, e in rows)
+
+    windows = open_windows(start, end, parse_operating_hours(space.operating_hours))
+    free = subtract_intervals(windows, busy)
+
+    return jsonify(
+        {
+            "space_id": space_id,
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "slot_minutes": slot_minutes,
+            "operating_hours": space.operating_hours,
+            "busy": _interval_list(busy),
+            "free": _interval_list(free),
+            "slots": _interval_list(split_slots(free, slot_minutes)),
+        }
+    ), 200
+
+
 @bookings_bp.delete("/<int:booking_id>")
 @jwt_required()
 def delete_booking(booking_id: int):
@@ -168,15 +343,14 @@ def create_booking():
     if not space:
         return jsonify({"error": "Space not found"}), 404
 
-    if overlap_exists(space.id, start_time, end_time):
-        return jsonify({"error": "Time slot unavailable"}), 409
-
-    duration_minutes = int((end_time - start_time).total_seconds() // 60)
+    duration_minutes, total_cost = _booking_cost(space, start_time, end_time)
     if duration_minutes < 1:
         return jsonify({"error": "booking duration too short"}), 400
 
-    hours = duration_minutes / 60.0
-    total_cost = int(round(float(space.price_per_hour) * hours))
+    _lock_space_bookings(space.id)
+    if overlap_exists(space.id, start_time, end_time):
+        db.session.rollback()
+        return jsonify({"error": "Time slot unavailable"}), 409
 
     booking = Booking(
         user_id=uid,
@@ -188,11 +362,201 @@ def create_booking():
         status="confirmed",
     )
     db.session.add(booking)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError as exc:
+        db.session.rollback()
+        if _is_overlap_violation(exc):
+            return jsonify({"error": "Time slot unavailable"}), 409
+        raise
 
     return (
         jsonify(
           {"booking": {**booking.to_dict(), "payment_status": "unpaid", "invoice_id": None}}
         ),
         201,
-    )
\ No newline at end of file
+    )
+
+
+BATCH_MAX_OCCURRENCES = 100
+_RECURRENCE_STEPS = {"daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+_BATCH_MODES = ("all_or_nothing", "partial")
+
+
+def _expand_recurrence(start_time: datetime, end_time: datetime, rule: dict):
+    """
+    Expands {"freq": "daily"|"weekly", "interval": 1, "count": n | "until": iso}
+    into [(start, end), ...]. Returns (occurrences, error).
+    """
+    step = _RECURRENCE_STEPS.get(str(rule.get("freq") or "").lower())
+    if step is None:
+        return None, f"recurrence.freq must be one of: {sorted(_RECURRENCE_STEPS)}"
+
+    interval = _as_int(rule.get("interval", 1))
+    if interval is None or interval < 1:
+        return None, "recurrence.interval must be a positive integer"
+    step *= interval
+
+    count = rule.get("count")
+    until = _parse_dt(rule.get("until"))
+    if (count is None) == (until is None):
+        return None, "recurrence needs exactly one of count or until"
+
+    if count is not None:
+        count = _as_int(count)
+        if count is None or count < 1:
+            return None, "recurrence.count must be a positive integer"
+    else:
+        if until < start_time:
+            return None, "recurrence.until must not be before start_time"
+        count = int((until - start_time) / step) + 1
+
+    if count > BATCH_MAX_OCCURRENCES:
+        return None, f"at most {BATCH_MAX_OCCURRENCES} occurrences per batch"
+
+    return [(start_time + step * i, end_time + step * i) for i in range(count)], None
+
+
+def _batch_occurrences(data: dict):
+    """
+    Returns (occurrences, error) from either an explicit "occurrences" list or
+    start_time/end_time plus a "recurrence" rule. Unparseable entries are kept
+    as (None, None) so they get a per-occurrence result.
+    """
+    if data.get("occurrences") is not None:
+        items = data["occurrences"]
+        if not isinstance(items, list) or not items:
+            return None, "occurrences must be a non-empty list"
+        if len(items) > BATCH_MAX_OCCURRENCES:
+            return None, f"at most {BATCH_MAX_OCCURRENCES} occurrences per batch"
+        occurrences = []
+        for item in items:
+            item = item if isinstance(item, dict) else {}
+            occurrences.append(
+                (_parse_dt(item.get("start_time")), _parse_dt(item.get("end_time")))
+            )
+        return occurrences, None
+
+    start_time = _parse_dt(data.get("start_time"))
+    end_time = _parse_dt(data.get("end_time"))
+    rule = data.get("recurrence")
+    if not start_time or not end_time or not isinstance(rule, dict):
+        return None, "occurrences or start_time, end_time and recurrence are required"
+    if start_time >= end_time:
+        return None, "end_time must be after start_time"
+    return _expand_recurrence(start_time, end_time, rule)
+
+
+@bookings_bp.post("/batch")
+@jwt_required()
+def create_booking_batch():
+    """
+    Books a series of occurrences of one space in a single transaction.
+    All occurrences are checked against existing bookings with one range
+    query. mode=all_or_nothing (default) inserts nothing if any occurrence
+    fails; mode=partial inserts the ones that are free.
+    """
+    uid = _as_int(get_jwt_identity())
+    if uid is None:
+        return jsonify({"error": "invalid token identity"}), 401
+
+    data = request.get_json(silent=True) or {}
+
+    space_id = _as_int(data.get("space_id"))
+    if not space_id:
+        return jsonify({"error": "space_id is required"}), 400
+
+    mode = data.get("mode") or "all_or_nothing"
+    if mode not in _BATCH_MODES:
+        return jsonify({"error": f"mode must be one of: {list(_BATCH_MODES)}"}), 400
+
+    occurrences, error = _batch_occurrences(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    space = db.session.get(Space, space_id)
+    if not space:
+        return jsonify({"error": "Space not found"}), 404
+
+    results = []
+    candidates = []
+    for index, (start_time, end_time) in enumerate(occurrences):
+        result = {
+            "index": index,
+            "start_time": start_time.isoformat() if start_time else None,
+            "end_time": end_time.isoformat() if end_time else None,
+        }
+        results.append(result)
+        if not start_time or not end_time or start_time >= end_time:
+            result.update(status="invalid", error="start_time and end_time must be ISO and ordered")
+            continue
+        duration_minutes, total_cost = _booking_cost(space, start_time, end_time)
+        if duration_minutes < 1:
+            result.update(status="invalid", error="booking duration too short")
+            continue
+        candidates.append((result, start_time, end_time, duration_minutes, total_cost))
+
+    _lock_space_bookings(space.id)
+
+    existing = []
+    if candidates:
+        window_start = min(c[1] for c in candidates)
+        window_end = max(c[2] for c in candidates)
+        existing = (
+            db.session.query(Booking.start_time, Booking.end_time)
+            .filter(_blocking(space.id, window_start, window_end))
+            .all()
+        )
+    overlaps_existing = overlap_checker(merge_intervals(existing))
+
+    accepted = []
+    for result, start_time, end_time, duration_minutes, total_cost in candidates:
+        if overlaps_existing(start_time, end_time) or any(
+            start_time < b.end_time and end_time > b.start_time for _r, b in accepted
+        ):
+            result.update(status="conflict", error="Time slot unavailable")
+            continue
+        booking = Booking(
+            user_id=uid,
+            space_id=space.id,
+            start_time=start_time,
+            end_time=end_time,
+            duration=duration_minutes,
+            total_cost=total_cost,
+            status="confirmed",
+        )
+        accepted.append((result, booking))
+
+    failed = len(results) - len(accepted)
+    if not accepted or (failed and mode == "all_or_nothing"):
+        db.session.rollback()
+        for result, _booking in accepted:
+            result["status"] = "skipped"
+        return jsonify(
+            {"error": "One or more occurrences could not be booked", "results": results}
+        ), 409
+
+    db.session.add_all([booking for _r, booking in accepted])
+    try:
+        db.session.commit()
+    except IntegrityError as exc:
+        db.session.rollback()
+        if _is_overlap_violation(exc):
+            return jsonify({"error": "Time slot unavailable", "results": results}), 409
+        raise
+
+    for result, booking in accepted:
+        result.update(
+            status="created",
+            booking={**booking.to_dict(), "payment_status": "unpaid", "invoice_id": None},
+        )
+
+    return jsonify(
+        {
+            "mode": mode,
+            "created": len(accepted),
+            "failed": failed,
+            "total_cost": sum(booking.total_cost for _r, booking in accepted),
+            "results": results,
+        }
+    ), 201
@@ -1,44 +1,103 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from app.extensions import db
 from app.models import Invoice, Booking, Space
+from app.utils.pagination import keyset_page, parse_limit
 
 invoices_bp = Blueprint("invoices", __name__, url_prefix="/api/invoices")
 
+_INVOICE_ORDER = [(Invoice.issued_at, True), (Invoice.id, True)]
+
+
+def _invoice_rows():
+    """
+    Invoice columns with their booking and space in one round trip.
+    """
+    return (
+        db.session.query(
+            Invoice.id,
+            Invoice.booking_id,
+            Invoice.user_id,
+            Invoice.amount_minor,
+            Invoice.currency,
+            Invoice.status,
+            Invoice.issued_at,
+            Invoice.due_at,
+            Booking.space_id,
+            Booking.start_time,
+            Booking.end_time,
+            Space.name.label("space_name"),
+            Space.location,
+        )
+        .outerjoin(Booking, Booking.id == Invoice.booking_id)
+        .outerjoin(Space, Space.id == Booking.space_id)
+    )
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _invoice_dict(row) -> dict:
+    return {
+        "id": row.id,
+        "booking_id": row.booking_id,
+        "user_id": row.user_id,
+        "amount_minor": row.amount_minor,
+        "amount": (row.amount_minor or 0) / 100.0,
+        "currency": row.currency,
+        "status": row.status,
+        "issued_at": _iso(row.issued_at),
+        "due_at": _iso(row.due_at),
+        "space_id": row.space_id,
+        "space_name": row.space_name,
+        "location": row.location,
+        "start_time": _iso(row.start_time),
+        "end_time": _iso(row.end_time),
+    }
+
+
+@invoices_bp.get("")
+@jwt_required()
+def list_invoices():
+    """
+    The caller's invoices, newest first; ?limit= and ?cursor= page through them.
+    """
+    user_id = int(get_jwt_identity())
+
+    limit = parse_limit(request.args.get("limit"), default=20, maximum=100)
+    if limit is None:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    try:
+        rows, next_cursor = keyset_page(
+            _invoice_rows().filter(Invoice.user_id == user_id),
+            _INVOICE_ORDER,
+            request.args.get("cursor"),
+            limit,
+            scope="invoices",
+        )
+    except ValueError:
+        return jsonify({"error": "invalid cursor"}), 400
+
+    return jsonify({
+        "invoices": [_invoice_dict(row) for row in rows],
+        "next_cursor": next_cursor,
+        "limit": limit,
+    }), 200
+
 
 @invoices_bp.get("/<int:invoice_id>")
 @jwt_required()
 def get_invoice(invoice_id: int):
     user_id = int(get_jwt_identity())
 
-    invoice = db.session.get(Invoice, invoice_id)
-    if not invoice:
+    row = _invoice_rows().filter(Invoice.id == invoice_id).first()
+    if not row:
         return jsonify({"error": "Invoice not found"}), 404
 
-    if invoice.user_id != user_id:
+    if row.user_id != user_id:
         return jsonify({"error": "Unauthorized"}), 403
 
-    booking = db.session.get(Booking, invoice.booking_id)
-    space = db.session.get(Space, booking.space_id) if booking else None
-
-    amount_kes = (invoice.amount_minor or 0) / 100.0
-
-    return jsonify({
-        "invoice": {
-            "id": invoice.id,
-            "booking_id": invoice.booking_id,
-            "user_id": invoice.user_id,
-            "amount_minor": invoice.amount_minor,
-            "amount": amount_kes,
-            "currency": invoice.currency,
-            "status": invoice.status,
-            "issued_at": invoice.issued_at.isoformat() if invoice.issued_at else None,
-            "due_at": invoice.due_at.isoformat() if invoice.due_at else None,
-            "space_id": booking.space_id if booking else None,
-            "space_name": space.name if space else None,
-            "location": space.location if space else None,
-            "start_time": booking.start_time.isoformat() if booking and booking.start_time else None,
-            "end_time": booking.end_time.isoformat() if booking and booking.end_time else None,
-        }
-    }), 200
+    return jsonify({"invoice": _invoice_dict(row)}), 200
@@ -1,19 +1,33 @@
-import stripe
-from stripe import StripeError
+import json
+from datetime import datetime, timedelta, timezone
+
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from app.extensions import db
 from app.models import Payment, Booking, Invoice
+from app.utils.stripe_events import (
+    TERMINAL_STATUSES,
+    apply_intent_status,
+    event_worker,
+    record_event,
+)
+from app.utils.stripe_gateway import (
+    InvalidWebhookSignature,
+    PaymentGatewayError,
+    stripe_gateway,
+    verify_webhook_signature,
+)
 
 payments_bp = Blueprint("payments", __name__, url_prefix="/api/payments")
 
 
-def _init_stripe():
-    secret = current_app.config.get("STRIPE_SECRET_KEY")
-    if not secret:
-        raise RuntimeError("STRIPE_SECRET_KEY not configured")
-    stripe.api_key = secret
+def _intent_idempotency_key(booking, amount_minor: int, currency: str, attempt: int = 1) -> str:
+    # same booking and amount -> same intent, however often the client retries;
+    # each canceled intent starts a new attempt, which must get a fresh intent
+    # rather than Stripe's replay of the canceled one
+    key = f"booking-{booking.id}-intent-{amount_minor}-{currency}"
+    return key if attempt == 1 else f"{key}-attempt-{attempt}"
 
 
 @payments_bp.post("/create-intent")
@@ -54,9 +68,6 @@ def create_payment_intent():
             db.session.rollback()
         return jsonify({"message": "Already paid", "invoice_id": existing_invoice.id, "client_secret": None}), 200
 
-    _init_stripe()
-
-    
     try:
         amount_kes = int(booking.total_cost)
     except (TypeError, ValueError):
@@ -68,35 +79,36 @@ def create_payment_intent():
     amount_minor = amount_kes * 100
     currency = "kes"
 
+    existing = (
+        Payment.query.filter_by(booking_id=booking.id, user_id=user_id)
+        .order_by(Payment.created_at.desc())
+        .first()
+    )
+    # canceled payments are kept (see below), so this stays stable across retries
+    attempt = 1 + Payment.query.filter_by(booking_id=booking.id, status="canceled").count()
+
     # Create Stripe intent
     try:
-        intent = stripe.PaymentIntent.create(
+        intent = stripe_gateway.create_payment_intent(
             amount=amount_minor,
             currency=currency,
             metadata={"booking_id": str(booking.id), "user_id": str(user_id)},
-            automatic_payment_methods={"enabled": True},
+            idempotency_key=_intent_idempotency_key(booking, amount_minor, currency, attempt),
         )
-    except StripeError as e:
+    except PaymentGatewayError as e:
         current_app.logger.exception("Stripe error creating PaymentIntent")
-        msg = getattr(e, "user_message", None) or str(e)
-        return jsonify({"error": msg}), 502
+        return jsonify({"error": e.message}), 502 if e.status else 504
     except Exception:
         current_app.logger.exception("Unknown error creating PaymentIntent")
         return jsonify({"error": "Failed to create payment intent"}), 502
 
     # Persist Payment record
     try:
-        existing = (
-            Payment.query.filter_by(booking_id=booking.id, user_id=user_id)
-            .order_by(Payment.created_at.desc())
-            .first()
-        )
-
-        if existing and existing.status != "succeeded":
+        if existing and existing.status not in TERMINAL_STATUSES:
             existing.amount_minor = amount_minor
             existing.currency = currency
-            existing.status = intent.status
-            existing.stripe_payment_intent_id = intent.id
+            existing.status = intent["status"]
+            existing.stripe_payment_intent_id = intent["id"]
             existing.invoice_id = None
         else:
             payment = Payment(
@@ -104,15 +116,15 @@ def create_payment_intent():
                 user_id=user_id,
                 amount_minor=amount_minor,
                 currency=currency,
-                status=intent.status,
-                stripe_payment_intent_id=intent.id,
+                status=intent["status"],
+                stripe_payment_intent_id=intent["id"],
                 invoice_id=None,
             )
             db.session.add(payment)
 
         db.session.commit()
 
-        return jsonify({"client_secret": intent.client_secret, "payment_intent_id": intent.id}), 201
+        return jsonify({"client_secret": intent["client_secret"], "payment_intent_id": intent["id"]}), 201
 
     except Exception:
         db.session.rollback()
@@ -120,71 +132,97 @@ def create_payment_intent():
         return jsonify({"error": "Failed to persist payment record"}), 500
 
 
+def _webhook_overdue(payment) -> bool:
+    created_at = payment.created_at
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    waited = datetime.utcnow() - created_at
+    return waited >= timedelta(seconds=current_app.config.get("STRIPE_CONFIRM_FALLBACK_AFTER", 15))
+
+
 @payments_bp.post("/confirm/<payment_intent_id>")
 @jwt_required()
 def confirm_payment(payment_intent_id: str):
+    """
+    Reports the payment as recorded by the webhook worker: 200 with the
+    invoice once paid, 202 while the webhook is outstanding (poll again
+    after Retry-After), 409 if the payment failed. Without
+    STRIPE_WEBHOOK_SECRET the intent is fetched from Stripe instead, as it
+    is for a pending payment whose webhook is more than
+    STRIPE_CONFIRM_FALLBACK_AFTER seconds overdue (e.g. a lost delivery).
+    """
     user_id = int(get_jwt_identity())
-    _init_stripe()
-
-    
-    try:
-        intent = stripe.PaymentIntent.retrieve(payment_intent_id)
-    except StripeError as e:
-        msg = getattr(e, "user_message", None) or str(e)
-        return jsonify({"error": msg}), 502
-    except Exception:
-        current_app.logger.exception("Failed to retrieve payment intent")
-        return jsonify({"error": "Failed to retrieve payment intent"}), 502
-
-    if intent.status != "succeeded":
-        return jsonify({"error": f"Payment not completed (status={intent.status})"}), 409
 
     payment = Payment.query.filter_by(stripe_payment_intent_id=payment_intent_id).first()
     if not payment:
         return jsonify({"error": "Payment record not found"}), 404
 
-    booking = db.session.get(Booking, payment.booking_id)
-    if not booking:
-        return jsonify({"error": "Booking not found"}), 404
-
-    if booking.user_id != user_id:
+    if payment.user_id != user_id:
         return jsonify({"error": "Unauthorized"}), 403
 
-    # Idempotency: invoice already exists
-    existing_invoice = Invoice.query.filter_by(booking_id=booking.id, user_id=user_id).first()
-    if existing_invoice:
+    if current_app.config.get("STRIPE_WEBHOOK_SECRET"):
+        ask_stripe = payment.status not in ("succeeded", "failed", "canceled") and _webhook_overdue(payment)
+    else:
+        ask_stripe = payment.status != "succeeded"
+
+    if ask_stripe:
+        try:
+            intent = stripe_gateway.retrieve_payment_intent(payment_intent_id)
+        except PaymentGatewayError as e:
+            return jsonify({"error": e.message}), 502 if e.status else 504
+        except Exception:
+            current_app.logger.exception("Failed to retrieve payment intent")
+            return jsonify({"error": "Failed to retrieve payment intent"}), 502
+
         try:
-            payment.status = "succeeded"
-            payment.invoice_id = existing_invoice.id
+            apply_intent_status(payment, intent["status"])
             db.session.commit()
-            return jsonify({"message": "Already confirmed", "invoice_id": existing_invoice.id}), 200
         except Exception:
             db.session.rollback()
-            current_app.logger.exception("Failed to update payment state")
-            return jsonify({"error": "Failed to update payment state"}), 500
+            current_app.logger.exception("Payment confirmation failed")
+            return jsonify({"error": "Payment confirmation failed"}), 500
 
-    # Create invoice + link it
-    try:
-        invoice = Invoice(
-            booking_id=booking.id,
-            user_id=user_id,
-            amount_minor=payment.amount_minor,
-            currency=payment.currency or "kes",
-            status="paid",
-        )
+    if payment.status == "succeeded" and payment.invoice_id:
+        return jsonify({"message": "Payment confirmed", "invoice_id": payment.invoice_id}), 200
 
-        payment.status = "succeeded"
+    if payment.status in ("failed", "canceled"):
+        return jsonify({"error": f"Payment not completed (status={payment.status})"}), 409
 
-        db.session.add(invoice)
-        db.session.flush()  # invoice.id
+    return (
+        jsonify({"status": "processing", "payment_status": payment.status}),
+        202,
+        {"Retry-After": "1"},
+    )
 
-        payment.invoice_id = invoice.id
 
-        db.session.commit()
-
-        return jsonify({"message": "Payment confirmed", "invoice_id": invoice.id}), 201
+@payments_bp.post("/webhook")
+def stripe_webhook():
+    """
+    Stripe webhook endpoint. Verifies the signature, appends the raw event
+    to stripe_events and answers 200 at once; the event worker applies it.
+    """
+    secret = current_app.config.get("STRIPE_WEBHOOK_SECRET")
+    if not secret:
+        return jsonify({"error": "webhooks are not configured"}), 404
 
-    except Exception:
-        db.session.rollback()
-        current_app.logger.exception("Payment confirmation failed")
-        return jsonify({"error": "Payment confirmation failed"}), 500
+    raw = request.get_data()
+    try:
+        verify_webhook_signature(
+            raw,
+            request.headers.get("Stripe-Signature"),
+            secret,
+            tolerance=current_app.config.get("STRIPE_WEBHOOK_TOLERANCE", 300),
+        )
+        event = json.loads(raw)
+        event_id = event["id"]
+    except InvalidWebhookSignature as e:
+        return jsonify({"error": f"invalid signature: {e}"}), 400
+    except (ValueError, KeyError, TypeError):
+        return jsonify({"error": "invalid event payload"}), 400
+
+    if record_event(event, raw):
+        event_worker.wake(current_app._get_current_object())
+    else:
+        current_app.logger.info("duplicate stripe event %s", event_id)
+
+    return jsonify({"received": True}), 200
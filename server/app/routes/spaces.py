@@ -1,40 +1,236 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy import exists, func, or_
+from sqlalchemy.orm import load_only
 
 from app.extensions import db
 from app.models import Space
+from app.routes.bookings import _blocking, _parse_dt
+from app.utils.authz import role_required
+from app.utils.pagination import parse_limit, keyset_page, order_by_clauses
+from app.utils.http_cache import conditional_response, make_etag
+from app.utils.cache import SPACES, invalidate_spaces, read_cache_version, space_cache
 
 spaces_bp = Blueprint("spaces", __name__, url_prefix="/api")
 
 
-def _require_admin():
-    claims = get_jwt()
-    if claims.get("role") != "admin":
-        return jsonify({"error": "admin access required"}), 403
-    return None
+def _parse_fields(raw: str | None):
+    """
+    Returns (fields, error). fields is None when no projection was requested.
+    """
+    if not raw:
+        return None, None
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in Space.SERIALIZED_FIELDS]
+    if unknown:
+        return None, f"unknown fields: {', '.join(unknown)}"
+    if "id" not in fields:
+        fields.insert(0, "id")
+    return fields, None
+
+
+# sort key -> leading order column; Space.id is always appended as tie-breaker
+_SPACE_SORTS = {
+    "id": (Space.id, False),
+    "name": (Space.name, False),
+    "price_asc": (Space.price_per_hour, False),
+    "price_desc": (Space.price_per_hour, True),
+    "capacity": (Space.capacity, False),
+    "capacity_desc": (Space.capacity, True),
+}
+
+
+def _space_order(sort: str | None):
+    """
+    Returns the keyset order for a sort key, or None if the key is unknown.
+    """
+    leading = _SPACE_SORTS.get(sort)
+    if leading is None:
+        return None
+    if leading[0] is Space.id:
+        return [leading]
+    return [leading, (Space.id, False)]
+
+
+def _like_pattern(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _as_number(value, cast):
+    if value in (None, ""):
+        return None, False
+    try:
+        return cast(value), False
+    except (TypeError, ValueError):
+        return None, True
+
+
+def _apply_space_filters(query, args):
+    """
+    Compiles the public search parameters into SQL filters.
+    Returns (query, error).
+
+    Text matching uses ILIKE, which the pg_trgm GIN indexes on Postgres
+    serve directly; SQLite falls back to a LIKE scan.
+    """
+    q = (args.get("q") or "").strip()
+    if q:
+        pattern = _like_pattern(q)
+        query = query.filter(
+            or_(
+                Space.name.ilike(pattern, escape="\\"),
+                Space.location.ilike(pattern, escape="\\"),
+                Space.description.ilike(pattern, escape="\\"),
+            )
+        )
+
+    location = (args.get("location") or "").strip()
+    if location:
+        query = query.filter(Space.location.ilike(_like_pattern(location), escape="\\"))
+
+    min_capacity, bad = _as_number(args.get("min_capacity"), int)
+    if bad:
+        return None, "min_capacity must be an integer"
+    if min_capacity is not None:
+        query = query.filter(Space.capacity >= min_capacity)
+
+    min_price, bad = _as_number(args.get("min_price"), float)
+    if bad:
+        return None, "min_price must be a number"
+    if min_price is not None:
+        query = query.filter(Space.price_per_hour >= min_price)
+
+    max_price, bad = _as_number(args.get("max_price"), float)
+    if bad:
+        return None, "max_price must be a number"
+    if max_price is not None:
+        query = query.filter(Space.price_per_hour <= max_price)
+
+    return query, None
+
+
+def _cached(key, build):
+    """
+    Serves a (body, status, headers) payload from space_cache, building it
+    on a miss, as a conditional response validated by the spaces version.
+    """
+    version, last_modified = read_cache_version(SPACES)
+    etag = make_etag(SPACES, version, *key)
+
+    def respond():
+        body, status, headers = space_cache.get_or_build(
+            key, version, build, cacheable=lambda payload: payload[1] in (200, 404)
+        )
+        return jsonify(body), status, headers
+
+    return conditional_response(respond, etag, last_modified)
 
 
 @spaces_bp.get("/spaces")
 def get_spaces():
-    spaces = Space.query.filter_by(is_active=True).all()
-    return jsonify([space.to_dict() for space in spaces]), 200
+    return _cached(("list", request.query_string.decode()), _spaces_listing)
+
+
+def _spaces_listing(query=None, always_paginate: bool = False):
+    """
+    Returns (body, status, headers) for the current request's query string.
+    query defaults to all active spaces.
+    """
+    fields, error = _parse_fields(request.args.get("fields"))
+    if error:
+        return {"error": error}, 400, {}
+
+    sort = request.args.get("sort") or "id"
+    order = _space_order(sort)
+    if order is None:
+        return {"error": f"sort must be one of: {sorted(_SPACE_SORTS)}"}, 400, {}
+
+    if query is None:
+        query = Space.query.filter_by(is_active=True)
+    query, error = _apply_space_filters(query, request.args)
+    if error:
+        return {"error": error}, 400, {}
+
+    count_query = query
+    if fields:
+        # sort columns must be loaded too, the cursor is built from them;
+        # "id" stays in the set so ?fields=id still passes load_only a column
+        loaded = set(fields) | {column.key for column, _desc in order}
+        query = query.options(load_only(*[getattr(Space, f) for f in sorted(loaded)]))
+
+    paginate = (
+        always_paginate
+        or "limit" in request.args
+        or "cursor" in request.args
+        or current_app.config.get("SPACES_PAGINATE_BY_DEFAULT")
+    )
+    if not paginate:
+        spaces = query.order_by(*order_by_clauses(order)).all()
+        return [space.to_dict(fields) for space in spaces], 200, {}
+
+    limit = parse_limit(
+        request.args.get("limit"), default=current_app.config.get("SPACES_PAGE_SIZE", 24)
+    )
+    if limit is None:
+        return {"error": "limit must be an integer"}, 400, {}
+
+    cursor = request.args.get("cursor")
+    try:
+        spaces, next_cursor = keyset_page(query, order, cursor, limit, scope=sort)
+    except ValueError:
+        return {"error": "invalid cursor"}, 400, {}
+
+    headers = {}
+    # Only the first page pays for the count; clients keep it while paging.
+    if not cursor:
+        total = count_query.with_entities(func.count(Space.id)).order_by(None).scalar()
+        headers["X-Total-Count"] = str(total)
+
+    body = {
+        "spaces": [space.to_dict(fields) for space in spaces],
+        "next_cursor": next_cursor,
+        "limit": limit,
+    }
+    return body, 200, headers
+
+
+@spaces_bp.get("/spaces/available")
+def available_spaces():
+    """
+    Active spaces with no blocking booking in [start_time, end_time),
+    as one NOT EXISTS anti-join. Accepts the same filters, sort and
+    pagination parameters as GET /spaces.
+    """
+    start_time = _parse_dt(request.args.get("start_time"))
+    end_time = _parse_dt(request.args.get("end_time"))
+
+    if not start_time or not end_time:
+        return jsonify({"error": "start_time and end_time are required (ISO format)"}), 400
+
+    if start_time >= end_time:
+        return jsonify({"error": "end_time must be after start_time"}), 400
+
+    booked = exists().where(_blocking(Space.id, start_time, end_time))
+    query = Space.query.filter(Space.is_active.is_(True), ~booked)
+
+    body, status, headers = _spaces_listing(query, always_paginate=True)
+    return jsonify(body), status, headers
 
 
 @spaces_bp.get("/spaces/<int:space_id>")
 def get_space(space_id):
-    space = Space.query.get_or_404(space_id)
-    if not space.is_active:
-        return jsonify({"error": "space not found"}), 404
-    return jsonify(space.to_dict()), 200
+    def build():
+        space = db.session.get(Space, space_id)
+        if not space or not space.is_active:
+            return {"error": "space not found"}, 404, {}
+        return space.to_dict(), 200, {}
+
+    return _cached(("detail", space_id), build)
 
 
 @spaces_bp.post("/admin/spaces")
-@jwt_required()
+@role_required("admin")
 def create_space():
-    denied = _require_admin()
-    if denied:
-        return denied
-
     data = request.get_json(silent=True) or {}
 
     required_fields = ["name", "description", "price_per_hour", "capacity"]
@@ -70,18 +266,15 @@ def create_space():
                 setattr(space, attr, str(value).strip())
 
     db.session.add(space)
+    invalidate_spaces()
     db.session.commit()
 
     return jsonify(space.to_dict()), 201
 
 
 @spaces_bp.put("/admin/spaces/<int:space_id>")
-@jwt_required()
+@role_required("admin")
 def update_space(space_id):
-    denied = _require_admin()
-    if denied:
-        return denied
-
     space = Space.query.get_or_404(space_id)
     data = request.get_json(silent=True) or {}
 
@@ -106,19 +299,17 @@ def update_space(space_id):
     if "operating_hours" in data and hasattr(space, "operating_hours"):
         space.operating_hours = str(data["operating_hours"] or "").strip()
 
+    invalidate_spaces()
     db.session.commit()
     return jsonify(space.to_dict()), 200
 
 
 @spaces_bp.delete("/admin/spaces/<int:space_id>")
-@jwt_required()
+@role_required("admin")
 def delete_space(space_id):
-    denied = _require_admin()
-    if denied:
-        return denied
-
     space = Space.query.get_or_404(space_id)
     space.is_active = False
+    invalidate_spaces()
     db.session.commit()
 
     return jsonify({"message": "space deleted"}), 200
\ No newline at end of file
@@ -1,11 +1,81 @@
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt
+from flask import g, jsonify
+from flask_jwt_extended import create_access_token, get_jwt, get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import select
+from werkzeug.local import LocalProxy
+
+from app.extensions import db, jwt
+from app.models import User
+from app.utils.cache import VersionedLRUCache
+from app.utils.replicas import replica_router
+
+
+# user id -> (token_version, is_active), re-read after AUTH_USER_CACHE_TTL seconds.
+# update_user drops the entry in its own worker; other workers catch up within the TTL.
+user_state_cache = VersionedLRUCache(maxsize=4096, ttl=30, config_prefix="AUTH_USER_CACHE")
+
+
+def issue_token(user: User) -> str:
+    return create_access_token(
+        identity=str(user.id),
+        additional_claims={"role": user.role, "tv": user.token_version or 0},
+    )
+
+
+def _user_state(user_id: int) -> tuple[int | None, bool]:
+    state = user_state_cache.get(user_id, 0)
+    if state is None:
+        # revocations must not wait on replication lag
+        with replica_router.primary():
+            row = db.session.execute(
+                select(User.token_version, User.is_active).where(User.id == user_id)
+            ).first()
+        state = (row.token_version, row.is_active) if row else (None, False)
+        user_state_cache.set(user_id, state, 0)
+    return state
+
+
+def invalidate_user(user_id: int) -> None:
+    user_state_cache.discard(user_id)
+
+
+@jwt.token_in_blocklist_loader
+def _token_revoked(_jwt_header, jwt_payload) -> bool:
+    """
+    Rejects tokens of deleted or deactivated users and tokens issued before
+    the user's last role / is_active change. Served from user_state_cache,
+    so most requests make no query.
+    """
+    try:
+        user_id = int(jwt_payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return True
+    token_version, is_active = _user_state(user_id)
+    return not is_active or token_version != jwt_payload.get("tv", 0)
+
+
+@jwt.revoked_token_loader
+def _revoked_response(_jwt_header, _jwt_payload):
+    return jsonify({"error": "token revoked, please sign in again"}), 401
+
+
+def get_current_user() -> User | None:
+    """
+    The authenticated User, loaded at most once per request. Call inside a
+    @jwt_required / @role_required view.
+    """
+    if "current_user" not in g:
+        g.current_user = db.session.get(User, int(get_jwt_identity()))
+    return g.current_user
+
+
+current_user = LocalProxy(get_current_user)
 
 
 def role_required(*roles: str):
     """
-    Use after/with @jwt_required on routes that require specific roles.
+    Verifies the JWT and its role claim; use instead of @jwt_required.
+    The claim can be trusted because a role change revokes older tokens.
     Example: @role_required("admin")
     """
     def decorator(fn):
@@ -15,7 +85,7 @@ def role_required(*roles: str):
             claims = get_jwt()
             role = claims.get("role")
             if role not in roles:
-                return jsonify({"error": "forbidden"}), 403
+                return jsonify({"error": f"{' or '.join(roles)} access required"}), 403
             return fn(*args, **kwargs)
         return wrapper
     return decorator
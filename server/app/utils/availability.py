@@ -0,0 +1,149 @@
+import re
+from bisect import bisect_right
+from datetime import datetime, time, timedelta
+
+
+_TIME_RE = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*([AaPp][Mm])?")
+_SLOT_RE = re.compile(r"^\s*(\d+)\s*([mh]?)\s*$", re.IGNORECASE)
+
+
+def parse_slot(value: str | None, default: int = 30) -> int | None:
+    """
+    "30m" / "1h" / "45" -> minutes. Returns None if unparseable.
+    """
+    if not value:
+        return default
+    match = _SLOT_RE.match(value)
+    if not match:
+        return None
+    amount = int(match.group(1))
+    return amount * 60 if match.group(2).lower() == "h" else amount
+
+
+def _to_time(hour: int, minute: int, meridiem: str | None) -> tuple[int, int] | None:
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.lower() == "pm" else 0)
+    if not (0 <= hour <= 24 and 0 <= minute < 60):
+        return None
+    return hour, minute
+
+
+def parse_operating_hours(value: str | None):
+    """
+    Parses the free-text Space.operating_hours, e.g. "7:00 AM - 10:00 PM Daily"
+    or "8:00 AM - 6:00 PM Weekdays".
+
+    Returns (open_minutes, close_minutes, weekdays_only) with minutes counted
+    from midnight; close may exceed 24h for venues open past midnight.
+    Returns None when the hours are missing or unparseable (treated as open
+    all day).
+    """
+    if not value or "24/7" in value or "24 hours" in value.lower():
+        return None
+    found = [m for m in _TIME_RE.finditer(value) if m.group(0).strip()]
+    if len(found) < 2:
+        return None
+
+    parsed = []
+    for m in found[:2]:
+        t = _to_time(int(m.group(1)), int(m.group(2) or 0), m.group(3))
+        if t is None:
+            return None
+        parsed.append(t[0] * 60 + t[1])
+
+    open_minutes, close_minutes = parsed
+    if close_minutes <= open_minutes:
+        close_minutes += 24 * 60
+    weekdays_only = "weekday" in value.lower()
+    return open_minutes, close_minutes, weekdays_only
+
+
+def open_windows(start: datetime, end: datetime, hours) -> list[tuple[datetime, datetime]]:
+    """
+    Opening windows of a space clipped to [start, end).
+    """
+    if hours is None:
+        return [(start, end)] if start < end else []
+
+    open_minutes, close_minutes, weekdays_only = hours
+    windows = []
+    # start a day early so a window running past midnight is included
+    day = datetime.combine(start.date() - timedelta(days=1), time(), tzinfo=start.tzinfo)
+    while day < end:
+        if not weekdays_only or day.weekday() < 5:
+            w_start = max(day + timedelta(minutes=open_minutes), start)
+            w_end = min(day + timedelta(minutes=close_minutes), end)
+            if w_start < w_end:
+                windows.append((w_start, w_end))
+        day += timedelta(days=1)
+    return merge_intervals(windows)
+
+
+def merge_intervals(intervals) -> list[tuple[datetime, datetime]]:
+    """
+    Sorted sweep: merges overlapping or touching intervals.
+    """
+    merged: list[tuple[datetime, datetime]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(windows, busy) -> list[tuple[datetime, datetime]]:
+    """
+    windows minus busy; both must be sorted and non-overlapping.
+    """
+    free = []
+    i = 0
+    for w_start, w_end in windows:
+        cursor = w_start
+        while i < len(busy) and busy[i][1] <= cursor:
+            i += 1
+        j = i
+        while j < len(busy) and busy[j][0] < w_end:
+            b_start, b_end = busy[j]
+            if b_start > cursor:
+                free.append((cursor, b_start))
+            cursor = max(cursor, b_end)
+            j += 1
+        if cursor < w_end:
+            free.append((cursor, w_end))
+    return free
+
+
+def split_slots(free, slot_minutes: int) -> list[tuple[datetime, datetime]]:
+    """
+    Slot-aligned (from midnight) chunks of slot_minutes lying fully inside a
+    free interval.
+    """
+    step = timedelta(minutes=slot_minutes)
+    slots = []
+    for start, end in free:
+        midnight = datetime.combine(start.date(), time(), tzinfo=start.tzinfo)
+        offset = (start - midnight) % step
+        cursor = start if not offset else start + (step - offset)
+        while cursor + step <= end:
+            slots.append((cursor, cursor + step))
+            cursor += step
+    return slots
+
+
+def overlap_checker(merged):
+    """
+    Returns overlaps(start, end) -> bool testing [start, end) against
+    `merged`, which must be sorted and non-overlapping (as returned by
+    merge_intervals). Each test is a binary search.
+    """
+    ends = [e for _s, e in merged]
+
+    def overlaps(start: datetime, end: datetime) -> bool:
+        i = bisect_right(ends, start)
+        return i < len(merged) and merged[i][0] < end
+
+    return overlaps
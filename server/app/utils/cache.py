@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from app.extensions import db
+from app.models.cache_version import CacheVersion
+
+
+SPACES = "spaces"
+
+
+class VersionedLRUCache:
+    """
+    Bounded in-process LRU with a per-entry TTL.
+
+    Every read passes the current dataset version; when it differs from the
+    version the entries were stored under, the whole cache is dropped. The
+    version comes from the cache_versions table, so a write in one gunicorn
+    worker invalidates the others on their next request.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0, config_prefix: str = ""):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.config_prefix = config_prefix
+        self._data: OrderedDict = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        Reads <config_prefix>_SIZE and <config_prefix>_TTL when set.
+        """
+        if self.config_prefix:
+            self.maxsize = int(app.config.get(f"{self.config_prefix}_SIZE", self.maxsize))
+            self.ttl = float(app.config.get(f"{self.config_prefix}_TTL", self.ttl))
+        self.clear()
+
+    def _sync(self, version) -> None:
+        if version != self._version:
+            self._data.clear()
+            self._version = version
+
+    def get(self, key, version):
+        with self._lock:
+            self._sync(version)
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, version) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._sync(version)
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_build(self, key, version, build, cacheable=None):
+        """
+        Returns the cached value for key, or build()'s result, storing it
+        when cacheable(value) is true (default: always).
+        """
+        value = self.get(key, version)
+        if value is not None:
+            return value
+        value = build()
+        if cacheable is None or cacheable(value):
+            self.set(key, value, version)
+        return value
+
+    def discard(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._version = None
+
+
+# serialized /api/spaces payloads, keyed by request
+space_cache = VersionedLRUCache(config_prefix="SPACES_CACHE")
+
+# /api/admin/stats results; short TTL only, never version-invalidated
+stats_cache = VersionedLRUCache(maxsize=32, ttl=30, config_prefix="ADMIN_STATS_CACHE")
+
+
+def read_cache_version(name: str) -> tuple[int, datetime | None]:
+    """
+    Returns (version, updated_at) for a dataset, (0, None) if never bumped.
+    """
+    row = db.session.execute(
+        select(CacheVersion.version, CacheVersion.updated_at).where(CacheVersion.name == name)
+    ).first()
+    if row is None:
+        return 0, None
+    return row.version, row.updated_at
+
+
+def bump_cache_version(name: str) -> None:
+    """
+    Increments a dataset's version inside the caller's transaction; the
+    caller commits.
+    """
+    now = datetime.utcnow()
+    result = db.session.execute(
+        update(CacheVersion)
+        .where(CacheVersion.name == name)
+        .values(version=CacheVersion.version + 1, updated_at=now)
+    )
+    if not result.rowcount:
+        db.session.add(CacheVersion(name=name, version=1, updated_at=now))
+
+
+def invalidate_spaces() -> None:
+    """
+    Call before committing any change to spaces.
+    """
+    bump_cache_version(SPACES)
+    space_cache.clear()
@@ -0,0 +1,109 @@
+import logging
+import time
+
+from flask import jsonify
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app.extensions import db
+from app.utils.metrics import TimedQueuePool
+
+
+logger = logging.getLogger("app.db")
+
+
+def _in_memory(uri: str) -> bool:
+    return uri in ("sqlite://", "sqlite:///") or ":memory:" in uri or "mode=memory" in uri
+
+
+def engine_options(uri: str, config) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS built from the DB_* settings. Pool sizing is
+    skipped for in-memory SQLite, which keeps its single-connection pool.
+    """
+    options = {"pool_pre_ping": config.get("DB_POOL_PRE_PING", True)}
+    if _in_memory(uri):
+        return options
+
+    options.update(
+        poolclass=TimedQueuePool,
+        pool_size=config.get("DB_POOL_SIZE", 5),
+        max_overflow=config.get("DB_MAX_OVERFLOW", 10),
+        pool_timeout=config.get("DB_POOL_TIMEOUT", 30),
+        pool_recycle=config.get("DB_POOL_RECYCLE", 1800),
+    )
+    if uri.startswith("postgresql"):
+        connect_args = {"connect_timeout": config.get("DB_CONNECT_TIMEOUT", 10)}
+        statement_timeout = config.get("DB_STATEMENT_TIMEOUT_MS", 0)
+        if statement_timeout:
+            connect_args["options"] = f"-c statement_timeout={int(statement_timeout)}"
+        options["connect_args"] = connect_args
+    return options
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"status": pool.status()}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+_sqlite_settings = {"wal": True, "busy_timeout": 5000}
+_listening = False
+
+
+def _sqlite_pragmas(dbapi_connection, _record):
+    if type(dbapi_connection).__module__.split(".")[0] not in ("sqlite3", "pysqlite2"):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(_sqlite_settings['busy_timeout'])}")
+    if _sqlite_settings["wal"]:
+        cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.close()
+
+
+def init_app(app):
+    """
+    SQLite connection pragmas (WAL journal, busy_timeout), GET /ready, and
+    a pool statistics log line every DB_POOL_LOG_INTERVAL seconds of
+    traffic (0 disables it).
+    """
+    global _listening
+    _sqlite_settings["wal"] = app.config.get("SQLITE_WAL", True)
+    _sqlite_settings["busy_timeout"] = app.config.get("SQLITE_BUSY_TIMEOUT_MS", 5000)
+    if not _listening:
+        # on the Engine class, so every engine the app creates gets the pragmas
+        event.listen(Engine, "connect", _sqlite_pragmas)
+        _listening = True
+
+    log_interval = float(app.config.get("DB_POOL_LOG_INTERVAL", 60))
+    next_log = [time.monotonic() + log_interval]
+
+    if log_interval > 0:
+        @app.after_request
+        def _log_pool_stats(response):
+            now = time.monotonic()
+            if now >= next_log[0]:
+                next_log[0] = now + log_interval
+                logger.info("db pool: %s", pool_stats(db.engine))
+            return response
+
+    @app.get("/ready")
+    def ready():
+        started = time.perf_counter()
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            logger.warning("readiness check failed: %s", exc)
+            return jsonify({"ready": False, "error": "database unavailable"}), 503
+        return jsonify({
+            "ready": True,
+            "db_ms": round((time.perf_counter() - started) * 1000, 1),
+            "pool": pool_stats(db.engine),
+        }), 200
@@ -0,0 +1,183 @@
+"""
+In-memory stand-in for the slice of the Stripe API the gateway uses, for
+local runs and benchmarks:
+
+    flask stripe fake-server --port 12111 --latency-ms 150 --fail-rate 0.1 \
+        --webhook-url http://127.0.0.1:5000/api/payments/webhook --webhook-secret whsec_fake
+    STRIPE_API_BASE=http://127.0.0.1:12111 STRIPE_SECRET_KEY=sk_test_fake \
+        STRIPE_WEBHOOK_SECRET=whsec_fake flask run
+
+POST /v1/payment_intents honours Idempotency-Key;
+POST /v1/payment_intents/<id>/confirm marks an intent succeeded and, with
+a webhook URL, delivers a signed payment_intent.succeeded event.
+signed_event() builds such deliveries for local tests.
+"""
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+
+import httpx
+
+from app.utils.stripe_gateway import webhook_signature
+
+
+def _unflatten(pairs) -> dict:
+    """[("metadata[a]", "1")] -> {"metadata": {"a": "1"}}"""
+    data: dict = {}
+    for name, value in pairs:
+        keys = name.replace("]", "").split("[")
+        target = data
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = value
+    return data
+
+
+def signed_event(event_type: str, intent: dict, secret: str,
+                 event_id: str | None = None) -> tuple[bytes, str]:
+    """
+    Returns (body, Stripe-Signature header) for a webhook delivery of
+    `intent` as event_type, e.g. "payment_intent.succeeded".
+    """
+    body = json.dumps({
+        "id": event_id or f"evt_fake_{secrets.token_hex(8)}",
+        "object": "event",
+        "type": event_type,
+        "created": int(time.time()),
+        "data": {"object": intent},
+    }).encode()
+    timestamp = int(time.time())
+    return body, f"t={timestamp},v1={webhook_signature(body, secret, timestamp)}"
+
+
+class FakeStripeState:
+    def __init__(self, latency: float = 0.0, fail_rate: float = 0.0,
+                 webhook_url: str | None = None, webhook_secret: str = ""):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.webhook_url = webhook_url
+        self.webhook_secret = webhook_secret
+        self.intents: dict[str, dict] = {}
+        self.idempotent: dict[str, dict] = {}
+        self.lock = threading.Lock()
+
+    def create_intent(self, params: dict, idempotency_key: str | None) -> dict:
+        with self.lock:
+            if idempotency_key and idempotency_key in self.idempotent:
+                return self.idempotent[idempotency_key]
+            intent_id = f"pi_fake_{secrets.token_hex(8)}"
+            intent = {
+                "id": intent_id,
+                "object": "payment_intent",
+                "amount": int(params.get("amount", 0)),
+                "currency": params.get("currency", "kes"),
+                "metadata": params.get("metadata", {}),
+                "status": "requires_payment_method",
+                "client_secret": f"{intent_id}_secret_{secrets.token_hex(8)}",
+                "created": int(time.time()),
+            }
+            self.intents[intent_id] = intent
+            if idempotency_key:
+                self.idempotent[idempotency_key] = intent
+            return intent
+
+    def deliver(self, event_type: str, intent: dict) -> None:
+        if not self.webhook_url:
+            return
+        body, signature = signed_event(event_type, intent, self.webhook_secret)
+
+        def send():
+            try:
+                httpx.post(
+                    self.webhook_url,
+                    content=body,
+                    headers={"Stripe-Signature": signature, "Content-Type": "application/json"},
+                    timeout=5,
+                )
+            except httpx.HTTPError:
+                pass
+
+        threading.Thread(target=send, daemon=True).start()
+
+
+def _handler(state: FakeStripeState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like api.stripe.com
+
+        def log_message(self, *_args):
+            pass
+
+        def _send(self, status: int, body: dict, headers: dict | None = None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _error(self, status: int, message: str, retry: bool = False):
+            headers = {"Stripe-Should-Retry": "true" if retry else "false"}
+            self._send(status, {"error": {"type": "api_error", "message": message}}, headers)
+
+        def _simulate(self) -> bool:
+            if state.latency:
+                time.sleep(state.latency)
+            if state.fail_rate and random.random() < state.fail_rate:
+                self._error(503, "simulated outage", retry=True)
+                return False
+            return True
+
+        def _intent_path(self):
+            parts = self.path.split("?")[0].strip("/").split("/")
+            if len(parts) >= 3 and parts[:2] == ["v1", "payment_intents"]:
+                return parts[2], parts[3:]
+            return None, None
+
+        def do_GET(self):
+            if not self._simulate():
+                return
+            intent_id, rest = self._intent_path()
+            intent = state.intents.get(intent_id)
+            if intent is None or rest:
+                return self._error(404, f"No such payment_intent: '{intent_id}'")
+            self._send(200, intent)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            params = _unflatten(parse_qsl(self.rfile.read(length).decode()))
+            if not self._simulate():
+                return
+
+            if self.path.split("?")[0].rstrip("/") == "/v1/payment_intents":
+                intent = state.create_intent(params, self.headers.get("Idempotency-Key"))
+                return self._send(200, intent)
+
+            intent_id, rest = self._intent_path()
+            intent = state.intents.get(intent_id)
+            if intent is None or rest != ["confirm"]:
+                return self._error(404, f"No such payment_intent: '{intent_id}'")
+            intent["status"] = "succeeded"
+            self._send(200, intent)
+            state.deliver("payment_intent.succeeded", dict(intent))
+
+    return Handler
+
+
+def make_server(host: str = "127.0.0.1", port: int = 12111, latency: float = 0.0,
+                fail_rate: float = 0.0, webhook_url: str | None = None,
+                webhook_secret: str = "") -> ThreadingHTTPServer:
+    """
+    Returns the server (port=0 picks a free one); call serve_forever(),
+    e.g. on a daemon thread.
+    """
+    state = FakeStripeState(latency, fail_rate, webhook_url, webhook_secret)
+    server = ThreadingHTTPServer((host, port), _handler(state))
+    server.daemon_threads = True
+    server.state = state
+    return server
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import jwt
+import requests
+from cryptography import x509
+
+from app.utils.cache import VersionedLRUCache
+
+
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class InvalidFirebaseToken(ValueError):
+    pass
+
+
+def _fetch_certs(url: str, timeout: float = 5.0):
+    """
+    Returns ({kid: PEM certificate or JWK dict}, max_age_seconds).
+    """
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+    max_age = int(match.group(1)) if match else 0
+    payload = response.json()
+    if "keys" in payload:  # JWKS
+        return {key["kid"]: key for key in payload["keys"]}, max_age
+    return payload, max_age
+
+
+def _public_key(cert):
+    if isinstance(cert, dict):
+        return jwt.PyJWK(cert).key
+    return x509.load_pem_x509_certificate(cert.encode()).public_key()
+
+
+class CertificateCache:
+    """
+    Google's token signing keys by kid, refetched when the max-age from the
+    last response has run out. An unknown kid triggers an early refetch,
+    at most once per min_refresh seconds.
+    """
+
+    def __init__(self, url: str = GOOGLE_CERTS_URL, fetch=None, min_refresh: float = 60.0):
+        self.url = url
+        self.fetch = fetch or _fetch_certs
+        self.min_refresh = min_refresh
+        self._keys: dict = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self, now: float) -> None:
+        certs, max_age = self.fetch(self.url)
+        self._keys = {kid: _public_key(cert) for kid, cert in certs.items()}
+        self._fetched_at = now
+        self._expires_at = now + max_age
+
+    def get(self, kid: str):
+        now = time.monotonic()
+        with self._lock:
+            stale = now >= self._expires_at
+            unknown = kid not in self._keys and now - self._fetched_at >= self.min_refresh
+            if stale or unknown:
+                self._refresh(now)
+            return self._keys.get(kid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = {}
+            self._expires_at = self._fetched_at = 0.0
+
+
+def _configured_project_id(app) -> str | None:
+    project_id = app.config.get("FIREBASE_PROJECT_ID")
+    if project_id:
+        return project_id
+
+    sa_json = os.getenv("FIREBASE_SERVICE_ACCOUNT_JSON")
+    if sa_json:
+        return json.loads(sa_json).get("project_id")
+
+    cred_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    if cred_path and os.path.exists(cred_path):
+        with open(cred_path, encoding="utf-8") as fh:
+            return json.load(fh).get("project_id")
+
+    return os.getenv("GOOGLE_CLOUD_PROJECT") or os.getenv("GCLOUD_PROJECT")
+
+
+class FirebaseTokenVerifier:
+    """
+    Verifies Firebase ID tokens locally with PyJWT against cached Google
+    certificates (the checks firebase_admin.auth.verify_id_token makes,
+    without revocation), and remembers verified tokens by SHA-256 in a small
+    LRU until FIREBASE_TOKEN_CACHE_TTL or the token's exp, whichever is first.
+    """
+
+    def __init__(self, project_id: str | None = None, certs: CertificateCache | None = None,
+                 leeway: int = 0):
+        self.project_id = project_id
+        self.certs = certs or CertificateCache()
+        self.leeway = leeway
+        self.tokens = VersionedLRUCache(maxsize=1024, ttl=300, config_prefix="FIREBASE_TOKEN_CACHE")
+
+    def init_app(self, app):
+        self.project_id = _configured_project_id(app)
+        self.certs = CertificateCache(app.config.get("FIREBASE_CERTS_URL") or GOOGLE_CERTS_URL)
+        self.tokens.init_app(app)
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.project_id)
+
+    def verify(self, id_token: str) -> dict:
+        digest = hashlib.sha256(id_token.encode()).hexdigest()
+        claims = self.tokens.get(digest, self.project_id)
+        if claims is not None and claims["exp"] > time.time():
+            return claims
+
+        claims = self._decode(id_token)
+        self.tokens.set(digest, claims, self.project_id)
+        return claims
+
+    def _decode(self, id_token: str) -> dict:
+        if not self.project_id:
+            raise InvalidFirebaseToken("firebase project id is not configured")
+        try:
+            header = jwt.get_unverified_header(id_token)
+        except jwt.PyJWTError as exc:
+            raise InvalidFirebaseToken(str(exc)) from exc
+        if header.get("alg") != "RS256" or not header.get("kid"):
+            raise InvalidFirebaseToken("unexpected token header")
+
+        key = self.certs.get(header["kid"])
+        if key is None:
+            raise InvalidFirebaseToken("unknown signing key")
+
+        try:
+            claims = jwt.decode(
+                id_token,
+                key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=f"https://securetoken.google.com/{self.project_id}",
+                leeway=self.leeway,
+                options={"require": ["exp", "iat", "aud", "iss", "sub", "auth_time"]},
+            )
+        except jwt.PyJWTError as exc:
+            raise InvalidFirebaseToken(str(exc)) from exc
+
+        sub = claims.get("sub")
+        if not isinstance(sub, str) or not sub or len(sub) > 128:
+            raise InvalidFirebaseToken("invalid subject")
+        if claims["auth_time"] > time.time() + self.leeway:
+            raise InvalidFirebaseToken("auth_time is in the future")
+        claims["uid"] = sub
+        return claims
+
+
+firebase_verifier = FirebaseTokenVerifier()
@@ -0,0 +1,53 @@
+import hashlib
+from datetime import datetime, timezone
+
+from flask import current_app, make_response, request
+
+
+def make_etag(*parts) -> str:
+    return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:32]
+
+
+def _http_datetime(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def _not_modified(etag: str, last_modified: datetime | None) -> bool:
+    # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2)
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional_response(build, etag: str, last_modified: datetime | None = None, max_age: int | None = None):
+    """
+    Answers 304 Not Modified without calling `build` when the client's
+    validators still match; otherwise returns build()'s response with
+    ETag / Last-Modified / Cache-Control set. Only 200 responses are
+    marked cacheable.
+    """
+    last_modified = _http_datetime(last_modified)
+    if max_age is None:
+        max_age = current_app.config.get("HTTP_CACHE_MAX_AGE", 60)
+
+    if _not_modified(etag, last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    # let browsers/CDNs serve stale while they revalidate in the background
+    response.cache_control.stale_while_revalidate = max_age * 5
+    return response
@@ -0,0 +1,127 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger("app.sql")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+# expanded IN lists: (?, ?, ?) / (%(a)s, %(b)s) / (%s, %s)
+_PARAM_LIST_RE = re.compile(r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+))*\s*\)")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalizes a statement so executions differing only in literals or
+    IN-list length compare equal.
+    """
+    statement = _STRING_RE.sub("?", statement)
+    statement = _NUMBER_RE.sub("?", statement)
+    statement = _PARAM_LIST_RE.sub("(?)", statement)
+    return _WHITESPACE_RE.sub(" ", statement).strip()
+
+
+class RequestSQLStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.db_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        self.fingerprints[fingerprint(statement)] += 1
+
+
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    if has_request_context() and "sql_stats" in g:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany):
+    if has_request_context() and "sql_stats" in g:
+        started = conn.info.get("query_started")
+        if started:
+            g.sql_stats.record(statement, time.perf_counter() - started.pop())
+
+
+_listening = False
+
+
+def init_app(app):
+    """
+    Per-request SQL accounting: query count, DB time and the slowest
+    statement go out as a Server-Timing header; requests repeating one
+    normalized statement more than SQL_REPEAT_THRESHOLD times (the N+1
+    shape) are logged as warnings on the "app.sql" logger, and every
+    request is logged when SQL_LOG_REQUESTS is set.
+    """
+    global _listening
+    if not app.config.get("SQL_INSTRUMENTATION", True):
+        return
+
+    if not _listening:
+        # on the Engine class, so every engine the app creates is covered
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _listening = True
+
+    threshold = app.config.get("SQL_REPEAT_THRESHOLD", 10)
+    log_all = app.config.get("SQL_LOG_REQUESTS", False)
+
+    @app.before_request
+    def _start_sql_stats():
+        g.sql_stats = RequestSQLStats()
+
+    @app.after_request
+    def _report_sql_stats(response):
+        stats = g.pop("sql_stats", None)
+        if stats is None:
+            return response
+
+        total_ms = (time.perf_counter() - stats.started) * 1000
+        db_ms = stats.db_seconds * 1000
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={db_ms:.1f};desc="{stats.count} queries", '
+            f"db-max;dur={stats.slowest_seconds * 1000:.1f}, app;dur={total_ms:.1f}",
+        )
+
+        repeated = {fp: n for fp, n in stats.fingerprints.items() if n > threshold}
+        if not (repeated or log_all):
+            return response
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 1),
+            "queries": stats.count,
+            "db_ms": round(db_ms, 1),
+            "slowest_ms": round(stats.slowest_seconds * 1000, 1),
+            "slowest_statement": (stats.slowest_statement or "")[:500] or None,
+        }
+        if repeated:
+            record["repeated_statements"] = [
+                {"count": n, "statement": fp[:500]}
+                for fp, n in sorted(repeated.items(), key=lambda item: -item[1])
+            ]
+            logger.warning("possible N+1 query: %s", json.dumps(record))
+        else:
+            logger.info("request sql: %s", json.dumps(record))
+        return response
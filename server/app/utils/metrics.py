@@ -0,0 +1,252 @@
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, current_app, g, jsonify, request
+from sqlalchemy.pool import QueuePool
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels, extra=()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsRegistry:
+    """
+    Counters, gauges and histograms kept per process.
+
+    With METRICS_DIR set (e.g. under gunicorn), each process also dumps its
+    series to METRICS_DIR/metrics-<pid>.json at most every
+    METRICS_FLUSH_INTERVAL seconds, and /metrics sums the files of every
+    worker. Counters and histograms of exited workers are kept so totals
+    stay monotonic; their gauges are dropped.
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.flush_interval = 1.0
+        self._types: dict[str, tuple[str, str, tuple]] = {}
+        self._values: dict = defaultdict(float)  # (name, labels) -> counter / gauge value
+        self._histograms: dict = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self._next_flush = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.directory = app.config.get("METRICS_DIR") or None
+        self.flush_interval = float(app.config.get("METRICS_FLUSH_INTERVAL", self.flush_interval))
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    # declaration
+
+    def counter(self, name: str, help_text: str) -> str:
+        self._types[name] = ("counter", help_text, ())
+        return name
+
+    def gauge(self, name: str, help_text: str) -> str:
+        self._types[name] = ("gauge", help_text, ())
+        return name
+
+    def histogram(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS) -> str:
+        self._types[name] = ("histogram", help_text, tuple(buckets))
+        return name
+
+    # recording
+
+    def inc(self, name: str, amount: float = 1.0, **labels) -> None:
+        with self._lock:
+            self._values[(name, _labels(labels))] += amount
+
+    def dec(self, name: str, amount: float = 1.0, **labels) -> None:
+        self.inc(name, -amount, **labels)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        buckets = self._types[name][2]
+        key = (name, _labels(labels))
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * len(buckets) + [0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    # multi-process
+
+    def _snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "values": [[n, list(map(list, l)), v] for (n, l), v in self._values.items()],
+                "histograms": [[n, list(map(list, l)), s] for (n, l), s in self._histograms.items()],
+            }
+
+    def flush(self, force: bool = False) -> None:
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now < self._next_flush:
+            return
+        self._next_flush = now + self.flush_interval
+
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".metrics-")
+        with os.fdopen(fd, "w") as fh:
+            json.dump(self._snapshot(), fh)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _collect(self):
+        if not self.directory:
+            snapshots = [(True, self._snapshot())]
+        else:
+            self.flush(force=True)
+            snapshots = []
+            for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+                pid = int(os.path.basename(path)[8:-5])
+                try:
+                    with open(path) as fh:
+                        snapshots.append((self._alive(pid), json.load(fh)))
+                except (OSError, ValueError):
+                    continue
+
+        values: dict = defaultdict(float)
+        histograms: dict = {}
+        for alive, snapshot in snapshots:
+            for name, labels, value in snapshot["values"]:
+                kind = self._types.get(name, ("counter",))[0]
+                if kind == "gauge" and not alive:
+                    continue
+                values[(name, tuple(map(tuple, labels)))] += value
+            for name, labels, series in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, [0] * len(series))
+                for i, v in enumerate(series):
+                    merged[i] += v
+        return values, histograms
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        values, histograms = self._collect()
+        lines = []
+        for name, (kind, help_text, buckets) in sorted(self._types.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind != "histogram":
+                for (n, labels), value in sorted(values.items()):
+                    if n == name:
+                        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+                continue
+            for (n, labels), series in sorted(histograms.items()):
+                if n != name:
+                    continue
+                for bound, count in zip(buckets, series):
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', f'{bound:g}')])} {count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {series[-1]}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {series[-2]:g}")
+                lines.append(f"{name}_count{_format_labels(labels)} {series[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+HTTP_REQUESTS = metrics.counter("http_requests_total", "HTTP responses by endpoint and status.")
+HTTP_LATENCY = metrics.histogram(
+    "http_request_duration_seconds", "Request latency by blueprint and endpoint."
+)
+HTTP_IN_FLIGHT = metrics.gauge("http_requests_in_flight", "Requests currently being handled.")
+DB_POOL_WAIT = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled DB connection.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+STRIPE_LATENCY = metrics.histogram(
+    "stripe_request_duration_seconds", "Stripe API call latency including retries."
+)
+RATE_LIMIT_REJECTIONS = metrics.counter(
+    "rate_limit_rejections_total", "Requests answered 429 by the rate limiter."
+)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait into db_pool_checkout_wait_seconds."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe(DB_POOL_WAIT, time.perf_counter() - started)
+
+
+def _authorized() -> bool:
+    token = current_app.config.get("METRICS_TOKEN")
+    return not token or request.headers.get("Authorization") == f"Bearer {token}"
+
+
+def init_app(app):
+    """
+    Registers request metrics and GET /metrics. Set METRICS_TOKEN to
+    require "Authorization: Bearer <token>" on scrapes.
+    """
+    metrics.init_app(app)
+
+    @app.before_request
+    def _start_request_metrics():
+        if request.endpoint == "metrics":
+            return
+        g.metrics_started = time.perf_counter()
+        metrics.inc(HTTP_IN_FLIGHT)
+
+    @app.teardown_request
+    def _finish_request_metrics(_exc=None):
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return
+        metrics.dec(HTTP_IN_FLIGHT)
+        labels = {
+            "blueprint": request.blueprint or "app",
+            "endpoint": request.endpoint or "unmatched",
+        }
+        metrics.observe(HTTP_LATENCY, time.perf_counter() - started, **labels)
+        status = g.pop("metrics_status", 500)
+        metrics.inc(HTTP_REQUESTS, method=request.method, status=status, **labels)
+        metrics.flush()
+
+    @app.after_request
+    def _record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.get("/metrics", endpoint="metrics")
+    def metrics_endpoint():
+        if not _authorized():
+            return jsonify({"error": "unauthorized"}), 401
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,128 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def parse_limit(value, default: int = DEFAULT_LIMIT, maximum: int = MAX_LIMIT) -> int | None:
+    """
+    Returns a page size clamped to [1, maximum], or None if value is not an integer.
+    """
+    if value in (None, ""):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return None
+    return max(1, min(limit, maximum))
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(values) -> str:
+    """
+    Opaque cursor for the sort key of the last row on a page.
+    """
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+_CURSOR_TYPES = (str, int, float, datetime)
+
+
+def decode_cursor(cursor: str | None) -> list | None:
+    """
+    Returns the decoded sort key, or None if the cursor is malformed or
+    holds anything but strings, numbers and datetimes.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(values, list):
+            return None
+        values = [_decode_value(v) for v in values]
+    except Exception:
+        return None
+    if any(isinstance(v, bool) or not isinstance(v, _CURSOR_TYPES) for v in values):
+        return None
+    return values
+
+
+def _matches_column(column, value) -> bool:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return True
+    if python_type in (int, float):
+        return isinstance(value, (int, float))
+    return isinstance(value, python_type)
+
+
+def keyset_after(order, values):
+    """
+    Builds the WHERE clause selecting rows strictly after `values` in `order`.
+
+    order: [(column, descending), ...] ending with a unique column (usually id)
+    values: the sort key of the last row already returned
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        value = values[i]
+        step = column < value if descending else column > value
+        prefix = [order[j][0] == values[j] for j in range(i)]
+        clauses.append(and_(*prefix, step) if prefix else step)
+    return or_(*clauses)
+
+
+def order_by_clauses(order):
+    return [column.desc() if descending else column.asc() for column, descending in order]
+
+
+def keyset_page(query, order, cursor: str | None, limit: int, key=None, scope: str = ""):
+    """
+    Applies keyset pagination to a query.
+
+    Returns (rows, next_cursor). `key(row)` must return the sort key values
+    of a row in the same order as `order`; it defaults to reading the
+    column attributes off the row. `scope` is stored in the cursor so a
+    cursor issued for one sort order is rejected by another.
+    Raises ValueError for a cursor that does not match `order`.
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        if not values or values[0] != scope or len(values) != len(order) + 1:
+            raise ValueError("invalid cursor")
+        if not all(_matches_column(column, v) for (column, _desc), v in zip(order, values[1:])):
+            raise ValueError("invalid cursor")
+        query = query.filter(keyset_after(order, values[1:]))
+
+    rows = query.order_by(*order_by_clauses(order)).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if key is None:
+            values = [getattr(last, column.key) for column, _desc in order]
+        else:
+            values = key(last)
+        next_cursor = encode_cursor([scope, *values])
+
+    return rows, next_cursor
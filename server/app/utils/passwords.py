@@ -0,0 +1,139 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+try:
+    import argon2
+except ImportError:  # optional: pip install argon2-cffi
+    argon2 = None
+
+
+class PasswordHashingBusy(RuntimeError):
+    """Every hashing slot stayed taken for PASSWORD_HASH_WAIT seconds."""
+
+
+def normalize_method(method: str) -> str:
+    """
+    Fills in the defaults of a method string so it compares equal to the
+    prefix of the hashes it produces, e.g. "pbkdf2" -> "pbkdf2:sha256:1000000".
+    """
+    name, *args = method.strip().split(":")
+    if name == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    if name == "scrypt":
+        n, r, p = (list(map(int, args)) + [2**15, 8, 1][len(args):])[:3]
+        return f"scrypt:{n}:{r}:{p}"
+    if name == "argon2":
+        if argon2 is None:
+            raise RuntimeError("argon2 password hashing requires argon2-cffi")
+        defaults = [
+            argon2.DEFAULT_TIME_COST, argon2.DEFAULT_MEMORY_COST, argon2.DEFAULT_PARALLELISM
+        ]
+        t, m, p = (list(map(int, args)) + defaults[len(args):])[:3]
+        return f"argon2:{t}:{m}:{p}"
+    raise ValueError(f"unsupported password hash method: {method}")
+
+
+def _argon2_hasher(method: str):
+    _name, t, m, p = method.split(":")
+    return argon2.PasswordHasher(time_cost=int(t), memory_cost=int(m), parallelism=int(p))
+
+
+# Module-level so they can run in pool processes.
+
+def _hash(method: str, raw_password: str) -> str:
+    if method.startswith("argon2"):
+        return _argon2_hasher(method).hash(raw_password)
+    return generate_password_hash(raw_password, method=method, salt_length=16)
+
+
+def _verify(stored: str, raw_password: str) -> bool:
+    if stored.startswith("$argon2"):
+        if argon2 is None:
+            return False
+        try:
+            return argon2.PasswordHasher().verify(stored, raw_password)
+        except (argon2.exceptions.Argon2Error, argon2.exceptions.InvalidHashError):
+            return False
+    return check_password_hash(stored, raw_password)
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords under the configured policy.
+
+    With PASSWORD_HASH_WORKERS = K > 0 the work runs in a pool of K
+    processes per app process, so a login surge saturates at most K cores
+    each while other requests keep their threads. At most
+    PASSWORD_HASH_MAX_PENDING more calls may wait for the pool; past that a
+    caller waits PASSWORD_HASH_WAIT seconds for a slot and then gets
+    PasswordHashingBusy. K = 0 hashes on the calling thread.
+    """
+
+    def __init__(self, method: str = "pbkdf2:sha256", workers: int = 0,
+                 max_pending: int = 32, wait: float = 5.0):
+        self.method = normalize_method(method)
+        self.workers = workers
+        self.wait = wait
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + max_pending)
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.shutdown()
+        self.method = normalize_method(app.config.get("PASSWORD_HASH_METHOD", "pbkdf2:sha256"))
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", 0)
+        self.wait = app.config.get("PASSWORD_HASH_WAIT", 5.0)
+        max_pending = app.config.get("PASSWORD_HASH_MAX_PENDING", 32)
+        self._slots = threading.BoundedSemaphore(max(self.workers, 1) + max_pending)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # a pool inherited across fork (e.g. gunicorn preload) is unusable
+        with self._pool_lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=_pool_context())
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.wait):
+            raise PasswordHashingBusy("password hashing is saturated")
+        try:
+            return self._executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, raw_password: str) -> str:
+        return self._run(_hash, self.method, raw_password)
+
+    def verify(self, stored: str, raw_password: str) -> bool:
+        return self._run(_verify, stored, raw_password)
+
+    def needs_rehash(self, stored: str) -> bool:
+        """True when `stored` was not produced under the current policy."""
+        if self.method.startswith("argon2"):
+            if not stored.startswith("$argon2"):
+                return True
+            return _argon2_hasher(self.method).check_needs_rehash(stored)
+        return stored.split("$", 1)[0] != self.method
+
+    def shutdown(self):
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+
+password_hasher = PasswordHasher()
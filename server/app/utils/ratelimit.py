@@ -0,0 +1,209 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.extensions import db
+from app.models.rate_limit_counter import RateLimitCounter
+from app.utils.metrics import RATE_LIMIT_REJECTIONS, metrics
+
+
+def client_ip() -> str:
+    forwarded_for = request.headers.get("X-Forwarded-For", "")
+    if forwarded_for:
+        return forwarded_for.split(",")[0].strip()
+    return request.remote_addr or "unknown"
+
+
+def _sliding(previous: int, current: int, now: float, window: int) -> tuple[float, int]:
+    """
+    Sliding-window counter: the previous fixed window is weighted by how much
+    of it still overlaps [now - window, now].
+    Returns (estimated hits in the last window, seconds until the window rolls).
+    """
+    elapsed = now % window
+    estimate = previous * (1 - elapsed / window) + current
+    retry_after = max(int(math.ceil(window - elapsed)), 1)
+    return estimate, retry_after
+
+
+class MemoryRateLimitBackend:
+    """
+    Per-process counters. Holds at most max_keys keys (least recently used
+    evicted first) and sweeps expired keys every sweep_interval seconds.
+    Each gunicorn worker enforces its own quota; use the SQL backend to
+    share one.
+    """
+
+    def __init__(self, max_keys: int = 10000, sweep_interval: float = 60.0):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        # key -> [window_index, current_count, previous_count, window_seconds]
+        self._counters: OrderedDict = OrderedDict()
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def _sweep(self, now: float) -> None:
+        expired = [
+            key for key, (index, _c, _p, window) in self._counters.items()
+            if (index + 2) * window <= now
+        ]
+        for key in expired:
+            del self._counters[key]
+        self._next_sweep = now + self.sweep_interval
+
+    def hit(self, key: str, limit: int, window: int) -> tuple[bool, int]:
+        now = time.time()
+        index = int(now // window)
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            entry = self._counters.get(key)
+            if entry is None or entry[0] < index - 1:
+                entry = [index, 0, 0, window]
+            elif entry[0] == index - 1:
+                entry = [index, 0, entry[1], window]
+            entry[1] += 1
+            self._counters[key] = entry
+            self._counters.move_to_end(key)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+
+            estimate, retry_after = _sliding(entry[2], entry[1], now, window)
+        return estimate > limit, retry_after
+
+
+class SQLRateLimitBackend:
+    """
+    Counters in the rate_limit_counters table, shared by every worker.
+    A hit is one atomic upsert (INSERT .. ON CONFLICT DO UPDATE .. RETURNING
+    on Postgres and SQLite) plus a read of the previous window, on a
+    connection of its own so it never touches the request's session.
+    """
+
+    def __init__(self, sweep_interval: float = 300.0):
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def _increment(self, conn, key: str, index: int, expires_at: int) -> int:
+        table = RateLimitCounter.__table__
+        dialect = conn.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = (
+                insert(table)
+                .values(key=key, window=index, count=1, expires_at=expires_at)
+                .on_conflict_do_update(
+                    index_elements=[table.c.key, table.c.window],
+                    set_={"count": table.c.count + 1},
+                )
+                .returning(table.c.count)
+            )
+            return conn.execute(stmt).scalar_one()
+
+        updated = conn.execute(
+            update(table)
+            .where(table.c.key == key, table.c.window == index)
+            .values(count=table.c.count + 1)
+        )
+        if not updated.rowcount:
+            conn.execute(
+                table.insert().values(key=key, window=index, count=1, expires_at=expires_at)
+            )
+        return conn.execute(
+            select(table.c.count).where(table.c.key == key, table.c.window == index)
+        ).scalar_one()
+
+    def _maybe_sweep(self, conn, now: float) -> None:
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + self.sweep_interval
+        table = RateLimitCounter.__table__
+        conn.execute(delete(table).where(table.c.expires_at < int(now)))
+
+    def hit(self, key: str, limit: int, window: int) -> tuple[bool, int]:
+        now = time.time()
+        index = int(now // window)
+        table = RateLimitCounter.__table__
+        with db.engine.begin() as conn:
+            current = self._increment(conn, key, index, (index + 2) * window)
+            previous = conn.execute(
+                select(table.c.count).where(table.c.key == key, table.c.window == index - 1)
+            ).scalar() or 0
+            self._maybe_sweep(conn, now)
+
+        estimate, retry_after = _sliding(previous, current, now, window)
+        return estimate > limit, retry_after
+
+
+class RateLimiter:
+    """
+    Front for the configured backend: RATE_LIMIT_BACKEND = "sql" | "memory".
+    """
+
+    def __init__(self):
+        self.backend = MemoryRateLimitBackend()
+        self.enabled = True
+
+    def init_app(self, app):
+        self.enabled = app.config.get("RATE_LIMIT_ENABLED", True)
+        name = app.config.get("RATE_LIMIT_BACKEND", "sql")
+        if name == "memory":
+            self.backend = MemoryRateLimitBackend(
+                max_keys=app.config.get("RATE_LIMIT_MEMORY_MAX_KEYS", 10000)
+            )
+        elif name == "sql":
+            self.backend = SQLRateLimitBackend()
+        else:
+            raise RuntimeError(f"unknown RATE_LIMIT_BACKEND: {name}")
+
+    def hit(self, key: str, limit: int, window: int) -> tuple[bool, int]:
+        if not self.enabled:
+            return False, 0
+        return self.backend.hit(key, limit, window)
+
+
+limiter = RateLimiter()
+
+
+def rate_limit(scope: str, count: int, window: int, key_func=None, counts=None):
+    """
+    Allows `count` requests per `window` seconds for each key, answering 429
+    with Retry-After beyond that. The key is the client IP plus whatever
+    key_func() returns (e.g. the submitted email). When counts() returns
+    false (e.g. a malformed payload) the request goes straight to the view,
+    so it neither uses up nor is blocked by the quota.
+    Example: @rate_limit("login", count=10, window=15 * 60, key_func=_email_key)
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if counts is not None and not counts():
+                return fn(*args, **kwargs)
+            parts = [scope, client_ip()]
+            if key_func is not None:
+                parts.append(str(key_func() or "unknown"))
+            key = ":".join(parts)
+            if len(key) > 200:
+                key = f"{scope}:{hashlib.sha256(key.encode()).hexdigest()}"
+            limited, retry_after = limiter.hit(key, count, window)
+            if limited:
+                metrics.inc(RATE_LIMIT_REJECTIONS, scope=scope)
+                current_app.logger.info("rate limit exceeded: %s", scope)
+                return (
+                    jsonify({"error": "too many attempts, try again later"}),
+                    429,
+                    {"Retry-After": str(retry_after)},
+                )
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,175 @@
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.sql import Select
+
+
+logger = logging.getLogger("app.db")
+
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRouter:
+    """
+    Sends the SELECTs of GET/HEAD/OPTIONS requests to the DATABASE_REPLICA_URLS
+    engines, round-robin. Everything else uses the primary: writes, locking
+    reads, requests with other methods, code outside a request (CLI, the
+    Stripe event worker), and every query of a request after its first
+    flush, so a request reads its own writes.
+
+    A replica that fails a connection is skipped until a SELECT 1 succeeds
+    again, tried at most every REPLICA_RETRY_INTERVAL seconds; with none
+    healthy, reads fall back to the primary. The read that ran into the
+    failure is retried once on the primary.
+
+    The SQL instrumentation and SQLite pragma listeners sit on the Engine
+    class, so they cover the replica engines as well.
+    """
+
+    def __init__(self):
+        self.replicas = []
+        self.retry_interval = 10.0
+        self._cycle = None
+        self._down: dict = {}  # engine -> monotonic time of the next health check
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        from app.utils.database import engine_options
+
+        for engine in self.replicas:
+            engine.dispose()
+        urls = [u.strip() for u in (app.config.get("DATABASE_REPLICA_URLS") or "").split(",") if u.strip()]
+        self.replicas = [create_engine(url, **engine_options(url, app.config)) for url in urls]
+        self.retry_interval = float(app.config.get("REPLICA_RETRY_INTERVAL", self.retry_interval))
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._down = {}
+        for engine in self.replicas:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine)
+
+    def mark_down(self, engine) -> None:
+        with self._lock:
+            if engine not in self._down:
+                logger.warning("replica %s unavailable, reading from primary", engine.url.render_as_string())
+            self._down[engine] = time.monotonic() + self.retry_interval
+
+    def _usable(self, engine) -> bool:
+        """
+        Healthy replicas are used as is: a dead connection is caught by the
+        pool's pre-ping and a failed connect by handle_error, which marks the
+        replica down from then on. Only a replica marked down is probed, at
+        most once per retry interval.
+        """
+        with self._lock:
+            retry_at = self._down.get(engine)
+            if retry_at is None:
+                return True
+            if time.monotonic() < retry_at:
+                return False
+            # one caller probes; the rest keep skipping it meanwhile
+            self._down[engine] = time.monotonic() + self.retry_interval
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception:
+            return False
+        with self._lock:
+            self._down.pop(engine, None)
+        logger.info("replica %s back in rotation", engine.url.render_as_string())
+        return True
+
+    def _wants_replica(self, clause) -> bool:
+        if self._cycle is None or not has_request_context():
+            return False
+        if request.method not in READ_METHODS or g.get("db_primary") or g.get("db_force_primary"):
+            return False
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            if clause is not None:
+                # a core write or a locking read; later reads must see it
+                g.db_primary = True
+            return False
+        return True
+
+    def failed_replica(self):
+        """The request's replica if a connection failure has marked it down."""
+        if not has_request_context() or g.get("db_primary") or g.get("db_force_primary"):
+            return None
+        engine = g.get("db_replica")
+        with self._lock:
+            return engine if engine in self._down else None
+
+    def engine_for(self, clause):
+        """A replica engine for this statement, or None for the primary."""
+        if not self._wants_replica(clause):
+            return None
+        # one engine per request, so its reads see a single snapshot
+        engine = g.get("db_replica")
+        if engine is not None and engine not in self._down:
+            return engine
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                engine = next(self._cycle)
+            if self._usable(engine):
+                g.db_replica = engine
+                return engine
+        return None
+
+    @contextmanager
+    def primary(self):
+        """Reads inside the block go to the primary, e.g. for auth state."""
+        if not has_request_context():
+            yield
+            return
+        previous = g.get("db_force_primary", False)
+        g.db_force_primary = True
+        try:
+            yield
+        finally:
+            g.db_force_primary = previous
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing:
+            replica = replica_router.engine_for(clause)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _read_with_fallback(self, run, *args, **kwargs):
+        try:
+            return run(*args, **kwargs)
+        except DBAPIError:
+            if replica_router.failed_replica() is None:
+                raise
+        with replica_router.primary():
+            return run(*args, **kwargs)
+
+    # Query.all(), Session.get() and lazy loads all go through execute()
+    def execute(self, *args, **kwargs):
+        return self._read_with_fallback(super().execute, *args, **kwargs)
+
+    def scalar(self, *args, **kwargs):
+        return self._read_with_fallback(super().scalar, *args, **kwargs)
+
+    def scalars(self, *args, **kwargs):
+        return self._read_with_fallback(super().scalars, *args, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _stick_to_primary(_session, _flush_context):
+    if has_request_context():
+        g.db_primary = True
@@ -0,0 +1,127 @@
+import csv
+import json
+import time
+from itertools import islice
+
+from sqlalchemy import func, insert
+
+from app.extensions import db
+from app.models import Space
+from app.utils.cache import invalidate_spaces
+from app.utils.space_validation import validate_space_payload
+
+
+IMPORT_CHUNK_SIZE = 500
+IMPORT_FORMATS = ("csv", "ndjson")
+_MAX_REPORTED_ERRORS = 100
+
+
+def _csv_value(key: str, value):
+    if value is None or value.strip() == "":
+        return None
+    value = value.strip()
+    if key == "is_active":
+        lowered = value.lower()
+        if lowered in ("1", "true", "yes"):
+            return True
+        if lowered in ("0", "false", "no"):
+            return False
+    return value
+
+
+def parse_rows(lines, fmt: str):
+    """
+    Lazily yields (line_number, row) from an iterable of text lines.
+    Rows that cannot be decoded are yielded as (line_number, None).
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            cleaned = {
+                k.strip(): _csv_value(k.strip(), v) for k, v in row.items() if k
+            }
+            yield reader.line_num, {k: v for k, v in cleaned.items() if v is not None}
+        return
+
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def _dedupe_key(values: dict) -> tuple[str, str]:
+    return values["name"].lower(), (values["location"] or "").lower()
+
+
+def _existing_keys(names) -> set[tuple[str, str]]:
+    rows = (
+        db.session.query(Space.name, Space.location)
+        .filter(func.lower(Space.name).in_(names))
+        .all()
+    )
+    return {(name.lower(), (location or "").lower()) for name, location in rows}
+
+
+def import_spaces(rows, chunk_size: int = IMPORT_CHUNK_SIZE, dry_run: bool = False) -> dict:
+    """
+    Validates and inserts spaces from parse_rows() output in chunks.
+
+    Rows whose (name, location) already exists, case-insensitively, or
+    repeats an earlier row of the same import are skipped. Each chunk costs
+    one lookup query and one multi-row INSERT, committed per chunk.
+    """
+    started = time.perf_counter()
+    report = {"read": 0, "inserted": 0, "duplicates": 0, "invalid": 0, "errors": []}
+    seen: set[tuple[str, str]] = set()
+
+    def record_error(line_number, message):
+        report["invalid"] += 1
+        if len(report["errors"]) < _MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line_number, "error": message})
+
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        report["read"] += len(chunk)
+
+        valid = []
+        for line_number, row in chunk:
+            if row is None:
+                record_error(line_number, "row is not a JSON object")
+                continue
+            values, error = validate_space_payload(row)
+            if error:
+                record_error(line_number, error)
+                continue
+            valid.append(values)
+
+        if not valid:
+            continue
+
+        existing = _existing_keys({v["name"].lower() for v in valid})
+        to_insert = []
+        for values in valid:
+            key = _dedupe_key(values)
+            if key in existing or key in seen:
+                report["duplicates"] += 1
+                continue
+            seen.add(key)
+            to_insert.append(values)
+
+        if to_insert and not dry_run:
+            db.session.execute(insert(Space), to_insert)
+            invalidate_spaces()
+            db.session.commit()
+        report["inserted"] += len(to_insert)
+
+    elapsed = time.perf_counter() - started
+    report["seconds"] = round(elapsed, 3)
+    report["rows_per_sec"] = round(report["read"] / elapsed, 1) if elapsed > 0 else None
+    report["dry_run"] = dry_run
+    return report
@@ -0,0 +1,65 @@
+def _text(data: dict, key: str) -> str:
+    return str(data.get(key) or "").strip()
+
+
+def validate_space_payload(data: dict) -> tuple[dict | None, str | None]:
+    """
+    Validates a new-space payload with the admin create rules.
+    Returns (Space column values, None) or (None, error message).
+    """
+    name = _text(data, "name")
+    description = _text(data, "description")
+    location = _text(data, "location") or None
+    operating_hours = _text(data, "operating_hours") or None
+    image_url = _text(data, "image_url") or None
+
+    price_per_hour = data.get("price_per_hour")
+    capacity = data.get("capacity")
+    max_capacity = data.get("max_capacity")
+
+    is_active = data.get("is_active", True)
+    if not isinstance(is_active, bool):
+        return None, "is_active must be boolean"
+
+    if not name:
+        return None, "name is required"
+    if not description:
+        return None, "description is required"
+
+    try:
+        price_per_hour = int(price_per_hour)
+    except Exception:
+        return None, "price_per_hour must be an integer"
+    if price_per_hour <= 0:
+        return None, "price_per_hour must be > 0"
+
+    try:
+        capacity = int(capacity)
+    except Exception:
+        return None, "capacity must be an integer"
+    if capacity <= 0:
+        return None, "capacity must be > 0"
+
+    if max_capacity is not None and max_capacity != "":
+        try:
+            max_capacity = int(max_capacity)
+        except Exception:
+            return None, "max_capacity must be an integer"
+        if max_capacity <= 0:
+            return None, "max_capacity must be > 0"
+        if max_capacity < capacity:
+            return None, "max_capacity cannot be less than capacity"
+    else:
+        max_capacity = None
+
+    return {
+        "name": name,
+        "description": description,
+        "location": location,
+        "price_per_hour": price_per_hour,
+        "capacity": capacity,
+        "max_capacity": max_capacity,
+        "operating_hours": operating_hours,
+        "image_url": image_url,
+        "is_active": is_active,
+    }, None
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+
+from flask import Response, request, stream_with_context
+
+
+STREAM_BATCH_SIZE = 500
+
+
+def iter_rows(query, batch_size: int = STREAM_BATCH_SIZE):
+    """
+    Iterates a query in batches via yield_per (server-side cursor on
+    Postgres), so a full table never sits in memory at once.
+    """
+    return query.yield_per(batch_size)
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_response(chunks, mimetype: str, filename: str | None = None) -> Response:
+    """
+    Streams text chunks, gzip-compressed on the fly when the client sends
+    Accept-Encoding: gzip.
+    """
+    headers = {"Vary": "Accept-Encoding"}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    if "gzip" in request.accept_encodings:
+        chunks = _gzip(chunks)
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+
+def plain_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def ndjson_response(rows, serialize, filename: str | None = None) -> Response:
+    """
+    Streams one JSON document per line.
+    """
+    def generate():
+        for row in rows:
+            yield json.dumps(serialize(row), default=str) + "\n"
+
+    return stream_response(generate(), "application/x-ndjson", filename)
+
+
+def csv_response(columns, rows, filename: str | None = None, batch_size: int = STREAM_BATCH_SIZE) -> Response:
+    """
+    Streams rows (sequences matching `columns`) as CSV, flushing every
+    batch_size rows.
+    """
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for i, row in enumerate(rows, 1):
+            writer.writerow([plain_value(v) for v in row])
+            if i % batch_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return stream_response(generate(), "text/csv", filename)
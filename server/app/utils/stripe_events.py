@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import Invoice, Payment, StripeEvent
+
+
+# statuses a later (possibly out-of-order) event must not move a payment out of
+TERMINAL_STATUSES = ("succeeded", "canceled")
+
+
+class PaymentNotRecorded(LookupError):
+    """The event's intent has no Payment row yet; retried on a later drain."""
+
+
+def record_event(event: dict, raw: bytes) -> bool:
+    """
+    Appends a verified webhook event; returns False for a redelivery.
+    """
+    values = {
+        "event_id": event["id"],
+        "type": event.get("type") or "",
+        "payload": raw.decode("utf-8"),
+        "received_at": datetime.utcnow(),
+        "attempts": 0,
+    }
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(StripeEvent).values(**values).on_conflict_do_nothing(
+            index_elements=[StripeEvent.event_id]
+        )
+        inserted = db.session.execute(stmt).rowcount
+        db.session.commit()
+        return bool(inserted)
+
+    try:
+        db.session.execute(insert(StripeEvent).values(**values))
+        db.session.commit()
+        return True
+    except IntegrityError:
+        db.session.rollback()
+        return False
+
+
+def _ensure_invoice(payment: Payment) -> Invoice:
+    invoice = Invoice.query.filter_by(booking_id=payment.booking_id).first()
+    if invoice is None:
+        try:
+            with db.session.begin_nested():
+                invoice = Invoice(
+                    booking_id=payment.booking_id,
+                    user_id=payment.user_id,
+                    amount_minor=payment.amount_minor,
+                    currency=payment.currency or "kes",
+                    status="paid",
+                )
+                db.session.add(invoice)
+        except IntegrityError:
+            # created concurrently by another worker
+            invoice = Invoice.query.filter_by(booking_id=payment.booking_id).first()
+    payment.invoice_id = invoice.id
+    return invoice
+
+
+def apply_intent_status(payment: Payment, status: str) -> Invoice | None:
+    """
+    Moves a payment to the intent's status and, on success, links the
+    booking's invoice, creating it once. Safe to repeat; the caller commits.
+    """
+    if payment.status not in TERMINAL_STATUSES:
+        payment.status = status
+    if payment.status == "succeeded":
+        return _ensure_invoice(payment)
+    return None
+
+
+def _apply_event(event: StripeEvent) -> None:
+    if not event.type.startswith("payment_intent."):
+        return
+    intent = json.loads(event.payload)["data"]["object"]
+    payment = Payment.query.filter_by(stripe_payment_intent_id=intent["id"]).first()
+    if payment is None:
+        raise PaymentNotRecorded(intent["id"])
+    # a failed attempt puts the intent back to requires_payment_method,
+    # indistinguishable from a fresh one; record it explicitly
+    failed = event.type == "payment_intent.payment_failed"
+    apply_intent_status(payment, "failed" if failed else intent["status"])
+
+
+def drain_events(batch_size: int = 100, max_attempts: int = 10) -> int:
+    """
+    Applies up to batch_size pending events in id order and commits.
+    Rows are claimed FOR UPDATE SKIP LOCKED on Postgres so several workers
+    can drain at once. A failing event is kept for retry until it has
+    failed max_attempts times. Returns the number of events applied.
+    """
+    events = db.session.scalars(
+        select(StripeEvent)
+        .where(StripeEvent.processed_at.is_(None), StripeEvent.attempts < max_attempts)
+        .order_by(StripeEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    applied = 0
+    for event in events:
+        try:
+            with db.session.begin_nested():
+                _apply_event(event)
+            event.processed_at = datetime.utcnow()
+            event.last_error = None
+            applied += 1
+        except Exception as exc:
+            event.attempts += 1
+            event.last_error = f"{exc.__class__.__name__}: {exc}"[:1000]
+
+    db.session.commit()
+    return applied
+
+
+class StripeEventWorker:
+    """
+    Background thread draining stripe_events. The webhook wakes it after
+    each insert, and it also polls every STRIPE_EVENTS_POLL_INTERVAL seconds
+    to pick up retries and events left by other processes. With
+    STRIPE_EVENTS_WORKER on it starts with the first request each process
+    serves, so CLI commands and a pre-forking master don't run it.
+    `flask stripe drain-events --loop` runs the same loop as a dedicated
+    process.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.interval = 5.0
+        self.batch_size = 100
+        self.max_attempts = 10
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config.get("STRIPE_EVENTS_WORKER", True)
+        self.interval = float(app.config.get("STRIPE_EVENTS_POLL_INTERVAL", self.interval))
+        self.batch_size = int(app.config.get("STRIPE_EVENTS_BATCH_SIZE", self.batch_size))
+        self.max_attempts = int(app.config.get("STRIPE_EVENTS_MAX_ATTEMPTS", self.max_attempts))
+
+        if self.enabled:
+            @app.before_request
+            def _start_stripe_event_worker():
+                self.start(app)
+
+    def drain_all(self) -> int:
+        # stops at the first batch that was not fully applied, so failing
+        # events wait for the next poll instead of burning their attempts
+        total = 0
+        while True:
+            applied = drain_events(self.batch_size, self.max_attempts)
+            total += applied
+            if applied < self.batch_size:
+                return total
+
+    def run(self, app) -> None:
+        while True:
+            with app.app_context():
+                try:
+                    self.drain_all()
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception("stripe event drain failed")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def _running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._pid == os.getpid()
+
+    def start(self, app) -> None:
+        """Starts the drain thread in this process unless it is already running."""
+        if not self.enabled or self._running():
+            return
+        with self._lock:
+            if not self._running():
+                self._thread = threading.Thread(
+                    target=self.run, args=(app,), name="stripe-events", daemon=True
+                )
+                self._pid = os.getpid()
+                self._thread.start()
+
+    def wake(self, app) -> None:
+        """Drains right away instead of at the next poll, e.g. after a webhook insert."""
+        if not self.enabled:
+            return
+        self.start(app)
+        self._wakeup.set()
+
+
+event_worker = StripeEventWorker()
@@ -0,0 +1,202 @@
+import hashlib
+import hmac
+import os
+import random
+import threading
+import time
+from urllib.parse import quote
+
+import httpx
+
+from app.utils.metrics import STRIPE_LATENCY, metrics
+
+
+class PaymentGatewayError(Exception):
+    """
+    A Stripe call that failed for good. status is Stripe's HTTP status, or
+    None when Stripe could not be reached in time.
+    """
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class InvalidWebhookSignature(ValueError):
+    pass
+
+
+def webhook_signature(payload: bytes, secret: str, timestamp: int) -> str:
+    signed = f"{timestamp}.".encode() + payload
+    return hmac.new(secret.encode(), signed, hashlib.sha256).hexdigest()
+
+
+def verify_webhook_signature(payload: bytes, header: str | None, secret: str,
+                             tolerance: int = 300) -> None:
+    """
+    Checks a Stripe-Signature header ("t=<ts>,v1=<hex>[,v1=...]") against the
+    raw request body; raises InvalidWebhookSignature.
+    """
+    timestamp, signatures = None, []
+    for part in (header or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name == "t" and value.isdigit():
+            timestamp = int(value)
+        elif name == "v1":
+            signatures.append(value)
+    if timestamp is None or not signatures:
+        raise InvalidWebhookSignature("malformed Stripe-Signature header")
+    if abs(time.time() - timestamp) > tolerance:
+        raise InvalidWebhookSignature("timestamp outside the tolerance zone")
+
+    expected = webhook_signature(payload, secret, timestamp)
+    if not any(hmac.compare_digest(expected, sig) for sig in signatures):
+        raise InvalidWebhookSignature("no matching signature")
+
+
+# 409 is an idempotency conflict with a request still in flight
+_RETRY_STATUSES = {409, 429, 500, 502, 503, 504}
+
+
+def _form(data, prefix: str = "") -> dict[str, str]:
+    """
+    Stripe's form encoding: {"metadata": {"a": 1}} -> {"metadata[a]": "1"}.
+    """
+    fields = {}
+    for key, value in data.items():
+        name = f"{prefix}[{key}]" if prefix else key
+        if isinstance(value, dict):
+            fields.update(_form(value, name))
+        elif isinstance(value, bool):
+            fields[name] = "true" if value else "false"
+        elif value is not None:
+            fields[name] = str(value)
+    return fields
+
+
+class StripeGateway:
+    """
+    Minimal Stripe REST client on one pooled keep-alive httpx.Client per
+    process, with strict connect/read timeouts. Calls are retried with
+    full-jitter exponential backoff on network errors, 409/429 and 5xx
+    (and whenever Stripe-Should-Retry says so). POSTs carry an
+    Idempotency-Key, so a retry never creates a second object.
+    """
+
+    def __init__(self):
+        self.secret_key = ""
+        self.api_base = "https://api.stripe.com"
+        self.connect_timeout = 2.0
+        self.read_timeout = 10.0
+        self.max_retries = 2
+        self.pool_size = 10
+        self._client = None
+        self._client_pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.close()
+        self.secret_key = app.config.get("STRIPE_SECRET_KEY", "")
+        self.api_base = (app.config.get("STRIPE_API_BASE") or self.api_base).rstrip("/")
+        self.connect_timeout = float(app.config.get("STRIPE_CONNECT_TIMEOUT", self.connect_timeout))
+        self.read_timeout = float(app.config.get("STRIPE_READ_TIMEOUT", self.read_timeout))
+        self.max_retries = int(app.config.get("STRIPE_MAX_RETRIES", self.max_retries))
+        self.pool_size = int(app.config.get("STRIPE_POOL_SIZE", self.pool_size))
+
+    def _http(self) -> httpx.Client:
+        if not self.secret_key:
+            raise RuntimeError("STRIPE_SECRET_KEY not configured")
+        # connections must not be shared with a forked parent
+        with self._lock:
+            if self._client is None or self._client_pid != os.getpid():
+                self._client = httpx.Client(
+                    base_url=self.api_base,
+                    auth=(self.secret_key, ""),
+                    timeout=httpx.Timeout(
+                        self.read_timeout, connect=self.connect_timeout, pool=self.connect_timeout
+                    ),
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                    ),
+                )
+                self._client_pid = os.getpid()
+            return self._client
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(2.0, 0.25 * 2**attempt))
+
+    def _request(self, operation: str, method: str, path: str, data: dict | None = None,
+                 idempotency_key: str | None = None) -> dict:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = self._send(method, path, data, idempotency_key)
+            outcome = "ok"
+            return result
+        finally:
+            metrics.observe(
+                STRIPE_LATENCY, time.perf_counter() - started, operation=operation, outcome=outcome
+            )
+
+    def _send(self, method: str, path: str, data: dict | None,
+              idempotency_key: str | None) -> dict:
+        client = self._http()
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+        for attempt in range(self.max_retries + 1):
+            last = attempt == self.max_retries
+            try:
+                response = client.request(
+                    method, path, data=_form(data) if data else None, headers=headers
+                )
+            except httpx.TransportError as exc:
+                if last:
+                    raise PaymentGatewayError(f"Stripe unreachable: {exc.__class__.__name__}") from exc
+                time.sleep(self._backoff(attempt))
+                continue
+
+            should_retry = response.headers.get("Stripe-Should-Retry")
+            retry = (
+                should_retry == "true"
+                or (should_retry != "false" and response.status_code in _RETRY_STATUSES)
+            )
+            if response.status_code < 400:
+                return response.json()
+            if not retry or last:
+                try:
+                    error = response.json().get("error") or {}
+                except ValueError:
+                    error = {}
+                message = error.get("message") or f"Stripe returned HTTP {response.status_code}"
+                raise PaymentGatewayError(message, response.status_code)
+            time.sleep(self._backoff(attempt))
+
+    def create_payment_intent(self, amount: int, currency: str, metadata: dict,
+                              idempotency_key: str) -> dict:
+        return self._request(
+            "create_payment_intent",
+            "POST",
+            "/v1/payment_intents",
+            {
+                "amount": amount,
+                "currency": currency,
+                "metadata": metadata,
+                "automatic_payment_methods": {"enabled": True},
+            },
+            idempotency_key=idempotency_key,
+        )
+
+    def retrieve_payment_intent(self, payment_intent_id: str) -> dict:
+        return self._request(
+            "retrieve_payment_intent", "GET", f"/v1/payment_intents/{quote(payment_intent_id, safe='')}"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None and self._client_pid == os.getpid():
+                self._client.close()
+            self._client = None
+
+
+stripe_gateway = StripeGateway()
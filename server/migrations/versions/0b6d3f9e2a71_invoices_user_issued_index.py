@@ -0,0 +1,26 @@
+"""invoices user issued index
+
+Revision ID: 0b6d3f9e2a71
+Revises: f48b2c6d0a13
+Create Date: 2026-10-18 21:12:40.318562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6d3f9e2a71'
+down_revision = 'f48b2c6d0a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.create_index('ix_invoices_user_issued', ['user_id', 'issued_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('invoices', schema=None) as batch_op:
+        batch_op.drop_index('ix_invoices_user_issued')
@@ -0,0 +1,50 @@
+"""space search indexes
+
+Revision ID: 3b1f6c2a9d10
+Revises: 8d7dd0384d6a
+Create Date: 2026-10-18 09:12:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b1f6c2a9d10'
+down_revision = '8d7dd0384d6a'
+branch_labels = None
+depends_on = None
+
+
+_TRGM_COLUMNS = ('name', 'location', 'description')
+
+
+def upgrade():
+    with op.batch_alter_table('spaces', schema=None) as batch_op:
+        batch_op.create_index('ix_spaces_active_name', ['is_active', 'name'], unique=False)
+        batch_op.create_index('ix_spaces_active_price', ['is_active', 'price_per_hour'], unique=False)
+        batch_op.create_index('ix_spaces_active_capacity', ['is_active', 'capacity'], unique=False)
+
+    # ILIKE '%q%' on Postgres is served by trigram GIN indexes; SQLite scans.
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in _TRGM_COLUMNS:
+            op.create_index(
+                f'ix_spaces_{column}_trgm',
+                'spaces',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        for column in _TRGM_COLUMNS:
+            op.drop_index(f'ix_spaces_{column}_trgm', table_name='spaces')
+
+    with op.batch_alter_table('spaces', schema=None) as batch_op:
+        batch_op.drop_index('ix_spaces_active_capacity')
+        batch_op.drop_index('ix_spaces_active_price')
+        batch_op.drop_index('ix_spaces_active_name')
@@ -0,0 +1,34 @@
+"""cache versions
+
+Revision ID: 6e2d4a8c1f37
+Revises: 3b1f6c2a9d10
+Create Date: 2026-10-18 11:40:05.532871
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2d4a8c1f37'
+down_revision = '3b1f6c2a9d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    cache_versions = op.create_table('cache_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(cache_versions, [
+        {'name': 'spaces', 'version': 1, 'updated_at': datetime.utcnow()},
+    ])
+
+
+def downgrade():
+    op.drop_table('cache_versions')
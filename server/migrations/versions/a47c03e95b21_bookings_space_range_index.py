@@ -0,0 +1,26 @@
+"""bookings space range index
+
+Revision ID: a47c03e95b21
+Revises: 6e2d4a8c1f37
+Create Date: 2026-10-18 14:03:52.907114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a47c03e95b21'
+down_revision = '6e2d4a8c1f37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_space_start_end', ['space_id', 'start_time', 'end_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookings_space_start_end')
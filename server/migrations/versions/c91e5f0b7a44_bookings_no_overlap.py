@@ -0,0 +1,38 @@
+"""bookings no overlap
+
+Revision ID: c91e5f0b7a44
+Revises: a47c03e95b21
+Create Date: 2026-10-18 15:27:19.640358
+
+Postgres only: rejects two non-cancelled bookings of the same space with
+overlapping [start_time, end_time) ranges. Existing overlaps must be
+resolved before upgrading. SQLite relies on the write lock taken in
+create_booking instead.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c91e5f0b7a44'
+down_revision = 'a47c03e95b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.execute(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_no_overlap "
+        "EXCLUDE USING gist (space_id WITH =, tsrange(start_time, end_time) WITH &&) "
+        "WHERE (status <> 'cancelled')"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_no_overlap')
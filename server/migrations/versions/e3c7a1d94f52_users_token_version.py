@@ -0,0 +1,26 @@
+"""users token version
+
+Revision ID: e3c7a1d94f52
+Revises: d5a8e2b61c09
+Create Date: 2026-10-18 18:02:11.540318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3c7a1d94f52'
+down_revision = 'd5a8e2b61c09'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
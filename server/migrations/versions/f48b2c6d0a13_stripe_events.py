@@ -0,0 +1,44 @@
+"""stripe events
+
+Revision ID: f48b2c6d0a13
+Revises: e3c7a1d94f52
+Create Date: 2026-10-18 18:31:47.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f48b2c6d0a13'
+down_revision = 'e3c7a1d94f52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stripe_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.String(length=255), nullable=False),
+    sa.Column('type', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('received_at', sa.DateTime(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id')
+    )
+    with op.batch_alter_table('stripe_events', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_stripe_events_pending', ['id'], unique=False,
+            postgresql_where=sa.text('processed_at IS NULL'),
+            sqlite_where=sa.text('processed_at IS NULL'),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('stripe_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_stripe_events_pending')
+
+    op.drop_table('stripe_events')
@@ -11,8 +11,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app
-from app.extensions import db  # <-- use extensions.db (your current structure)
 from app.models import Space
+from app.utils.space_import import import_spaces
 
 
 sample_spaces = [
@@ -157,24 +157,20 @@ def seed_spaces():
         existing_count = Space.query.count()
         print(f"📊 Current spaces in database: {existing_count}")
 
-        added = 0
-        for space_data in sample_spaces:
-            exists = Space.query.filter_by(name=space_data["name"]).first()
-            if exists:
-                continue
-            db.session.add(Space(**space_data))
-            added += 1
-            print(f"✓ Added: {space_data['name']}")
+        # same chunked, deduplicating path as `flask spaces import`
+        rows = enumerate(sample_spaces, 1)
+        report = import_spaces(rows)
 
-        if added:
-            db.session.commit()
-            print(f"\n✅ Successfully added {added} new spaces!")
+        if report["inserted"]:
+            print(f"\n✅ Successfully added {report['inserted']} new spaces!")
         else:
             print("✅ No new spaces to add (already seeded).")
+        for error in report["errors"]:
+            print(f"⚠️  Row {error['line']}: {error['error']}")
 
         total = Space.query.count()
         print(f"📊 Total spaces in database: {total}")
 
 
 if __name__ == "__main__":
-    seed_spaces()
\ No newline at end of file
+    seed_spaces()
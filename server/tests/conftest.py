@@ -0,0 +1,126 @@
+import os
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+# app.config reads these at import time
+os.environ.setdefault("FLASK_ENV", "development")
+os.environ.setdefault("RATE_LIMIT_BACKEND", "memory")
+os.environ.setdefault("STRIPE_EVENTS_WORKER", "false")
+os.environ.setdefault("PASSWORD_HASH_METHOD", "pbkdf2:sha256:1000")
+os.environ.setdefault("DB_POOL_LOG_INTERVAL", "0")
+
+from flask_migrate import downgrade, upgrade  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Booking, Space, User  # noqa: E402
+from app.utils.authz import issue_token  # noqa: E402
+from app.utils.fake_stripe import make_server  # noqa: E402
+from app.utils.stripe_gateway import stripe_gateway  # noqa: E402
+
+
+MIGRATIONS_DIR = str(SERVER_DIR / "migrations")
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """
+    App on a freshly migrated database: a file-backed SQLite database per
+    test, or TEST_DATABASE_URL (e.g. an empty Postgres database), which is
+    migrated down again afterwards.
+    """
+    shared_url = os.getenv("TEST_DATABASE_URL")
+    monkeypatch.setenv("DATABASE_URL", shared_url or f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        if shared_url:
+            downgrade(directory=MIGRATIONS_DIR, revision="base")
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """make_user(email, role="client") -> (user_id, auth headers)"""
+
+    def make(email: str = "client@example.com", role: str = "client"):
+        with app.app_context():
+            user = User(full_name=email.split("@")[0], email=email, role=role)
+            user.set_password("password123")
+            db.session.add(user)
+            db.session.commit()
+            return user.id, {"Authorization": f"Bearer {issue_token(user)}"}
+
+    return make
+
+
+@pytest.fixture
+def make_space(app):
+    def make(**values):
+        values = {
+            "name": "Studio",
+            "description": "A quiet room",
+            "price_per_hour": 1000,
+            "capacity": 4,
+            "is_active": True,
+            **values,
+        }
+        with app.app_context():
+            space = Space(**values)
+            db.session.add(space)
+            db.session.commit()
+            return space.id
+
+    return make
+
+
+@pytest.fixture
+def fake_stripe(app):
+    """Points the gateway at an in-process fake Stripe API; yields its state."""
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    app.config.update(
+        STRIPE_API_BASE=f"http://127.0.0.1:{server.server_port}",
+        STRIPE_SECRET_KEY="sk_test_fake",
+    )
+    stripe_gateway.init_app(app)
+    yield server.state
+    stripe_gateway.close()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_booking(app):
+    def make(user_id: int, space_id: int, day: int = 1, total_cost: int = 1000):
+        with app.app_context():
+            booking = Booking(
+                user_id=user_id,
+                space_id=space_id,
+                start_time=datetime(2026, 12, day, 9),
+                end_time=datetime(2026, 12, day, 10),
+                duration=60,
+                total_cost=total_cost,
+                status="confirmed",
+            )
+            db.session.add(booking)
+            db.session.commit()
+            return booking.id
+
+    return make
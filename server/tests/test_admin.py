@@ -0,0 +1,47 @@
+def test_user_search_treats_wildcards_literally(client, make_user):
+    _admin_id, headers = make_user("admin@example.com", role="admin")
+    make_user("a_b@example.com")
+    make_user("axb@example.com")
+    make_user("100%club@example.com")
+
+    def emails(q):
+        resp = client.get("/api/admin/users", query_string={"q": q}, headers=headers)
+        assert resp.status_code == 200
+        return sorted(user["email"] for user in resp.get_json()["users"])
+
+    assert emails("a_b") == ["a_b@example.com"]
+    assert emails("%") == ["100%club@example.com"]
+    assert emails("axb") == ["axb@example.com"]
+
+
+def test_user_listing_pages_with_cursor(client, make_user):
+    _admin_id, headers = make_user("admin@example.com", role="admin")
+    for i in range(4):
+        make_user(f"user{i}@example.com")
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "sort": "email", **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/admin/users", query_string=params, headers=headers).get_json()
+        seen += [user["email"] for user in body["users"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == sorted(seen) and len(seen) == 5
+
+
+def test_bulk_spaces_rejects_bad_ids(client, make_user, make_space):
+    _admin_id, headers = make_user("admin@example.com", role="admin")
+    space_id = make_space()
+
+    def bulk(ids):
+        return client.post(
+            "/api/admin/spaces/bulk", json={"action": "deactivate", "ids": ids}, headers=headers
+        )
+
+    for ids in ([1.9], [True], [None], ["1a"], ["-1"], list(range(1, 1002))):
+        assert bulk(ids).status_code == 400, ids
+
+    resp = bulk([space_id, str(space_id)])
+    assert resp.status_code == 200
+    assert resp.get_json()["results"] == [{"id": space_id, "outcome": "updated"}]
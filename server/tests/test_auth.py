@@ -0,0 +1,37 @@
+def test_malformed_logins_do_not_use_up_the_quota(client, make_user):
+    make_user("client@example.com")
+
+    for _ in range(15):
+        assert client.post("/api/auth/login", json={"email": "client@example.com"}).status_code == 400
+        assert client.post(
+            "/api/auth/login", json={"email": "not-an-email", "password": "x"}
+        ).status_code == 400
+
+    resp = client.post(
+        "/api/auth/login", json={"email": "client@example.com", "password": "password123"}
+    )
+    assert resp.status_code == 200
+
+
+def test_failed_logins_are_limited(client, make_user):
+    make_user("client@example.com")
+    attempt = {"email": "client@example.com", "password": "wrong-password1"}
+
+    for _ in range(10):
+        assert client.post("/api/auth/login", json=attempt).status_code == 401
+    resp = client.post("/api/auth/login", json=attempt)
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) > 0
+
+
+def test_invalid_registrations_do_not_use_up_the_quota(client):
+    for _ in range(10):
+        resp = client.post(
+            "/api/auth/register", json={"email": "new@example.com", "password": "short"}
+        )
+        assert resp.status_code == 400
+
+    resp = client.post(
+        "/api/auth/register", json={"email": "new@example.com", "password": "password123"}
+    )
+    assert resp.status_code == 201
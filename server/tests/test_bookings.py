@@ -0,0 +1,121 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.extensions import db
+from app.models import Booking
+
+
+def _book(client, headers, space_id, start, end):
+    return client.post(
+        "/api/bookings",
+        json={"space_id": space_id, "start_time": start, "end_time": end},
+        headers=headers,
+    )
+
+
+def test_calendar_accepts_offset_timestamps(client, make_user, make_space):
+    _uid, headers = make_user()
+    space_id = make_space()
+    resp = _book(client, headers, space_id, "2026-11-02T09:00:00", "2026-11-02T10:00:00")
+    assert resp.status_code == 201
+
+    resp = client.get(
+        f"/api/bookings/space/{space_id}/calendar"
+        "?from=2026-11-02T00:00:00Z&to=2026-11-02T12:00:00%2B00:00&slot=1h"
+    )
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["from"] == "2026-11-02T00:00:00"
+    assert body["busy"] == [{"start": "2026-11-02T09:00:00", "end": "2026-11-02T10:00:00"}]
+
+    # +03:00 is shifted to UTC before comparing with stored bookings
+    resp = client.get(
+        f"/api/bookings/space/{space_id}/calendar"
+        "?from=2026-11-02T11:30:00%2B03:00&to=2026-11-02T15:00:00%2B03:00&slot=30m"
+    )
+    assert resp.status_code == 200
+    assert resp.get_json()["busy"] == [
+        {"start": "2026-11-02T09:00:00", "end": "2026-11-02T10:00:00"}
+    ]
+
+
+def test_booking_with_offset_conflicts_with_naive_booking(client, make_user, make_space):
+    _uid, headers = make_user()
+    space_id = make_space()
+    assert _book(client, headers, space_id, "2026-11-02T09:00:00", "2026-11-02T10:00:00").status_code == 201
+
+    resp = _book(client, headers, space_id, "2026-11-02T12:30:00+03:00", "2026-11-02T13:30:00+03:00")
+    assert resp.status_code == 409
+
+
+def test_parallel_bookings_for_one_slot(app, make_user, make_space):
+    """Exactly one of N concurrent requests for the same slot wins."""
+    workers = 8
+    _uid, headers = make_user()
+    space_id = make_space()
+    barrier = threading.Barrier(workers)
+
+    def attempt(_):
+        client = app.test_client()
+        barrier.wait()
+        return _book(client, headers, space_id, "2026-12-01T09:00:00", "2026-12-01T11:00:00").status_code
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        statuses = list(pool.map(attempt, range(workers)))
+
+    assert sorted(statuses) == [201] + [409] * (workers - 1)
+    with app.app_context():
+        assert Booking.query.filter_by(space_id=space_id).count() == 1
+
+
+def test_batch_with_offsets_against_existing_bookings(client, make_user, make_space):
+    _uid, headers = make_user()
+    space_id = make_space()
+    assert _book(client, headers, space_id, "2026-11-03T09:00:00", "2026-11-03T10:00:00").status_code == 201
+
+    occurrences = [
+        # 09:30Z overlaps the stored 09:00-10:00 booking
+        {"start_time": "2026-11-03T09:30:00Z", "end_time": "2026-11-03T10:30:00Z"},
+        {"start_time": "2026-11-04T12:00:00+03:00", "end_time": "2026-11-04T13:00:00+03:00"},
+        {"start_time": "2026-11-05T09:00:00", "end_time": "2026-11-05T10:00:00"},
+    ]
+    resp = client.post(
+        "/api/bookings/batch",
+        json={"space_id": space_id, "mode": "partial", "occurrences": occurrences},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+    results = resp.get_json()["results"]
+    assert [r["status"] for r in results] == ["conflict", "created", "created"]
+    assert results[1]["start_time"] == "2026-11-04T09:00:00"
+
+    resp = client.post(
+        "/api/bookings/batch",
+        json={
+            "space_id": space_id,
+            "start_time": "2026-11-01T09:00:00Z",
+            "end_time": "2026-11-01T10:00:00Z",
+            "recurrence": {"freq": "daily", "until": "2026-11-06T00:00:00+00:00"},
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 409
+    statuses = [r["status"] for r in resp.get_json()["results"]]
+    assert statuses == ["skipped", "skipped", "conflict", "conflict", "conflict"]
+
+
+def test_cancelled_booking_still_holds_its_slot(app, client, make_user, make_space, make_booking):
+    uid, headers = make_user()
+    space_id = make_space()
+    booking_id = make_booking(uid, space_id, day=3)
+    with app.app_context():
+        db.session.get(Booking, booking_id).status = "cancelled"
+        db.session.commit()
+
+    resp = _book(client, headers, space_id, "2026-12-03T09:30:00", "2026-12-03T10:30:00")
+    assert resp.status_code == 409
+
+    resp = client.get(
+        f"/api/bookings/space/{space_id}/calendar?from=2026-12-03T08:00:00&to=2026-12-03T12:00:00"
+    )
+    assert resp.get_json()["busy"] == [{"start": "2026-12-03T09:00:00", "end": "2026-12-03T10:00:00"}]
@@ -0,0 +1,148 @@
+import time
+
+import jwt
+import pytest
+import requests
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from app.utils.firebase_tokens import (
+    CertificateCache,
+    FirebaseTokenVerifier,
+    InvalidFirebaseToken,
+    firebase_verifier,
+)
+
+PROJECT_ID = "spacer-test"
+
+
+def _key(kid: str):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private.public_key(), as_dict=True)
+    return private, {**jwk, "kid": kid}
+
+
+KEY_A, JWK_A = _key("key-a")
+KEY_B, JWK_B = _key("key-b")
+
+
+def _token(private_key=KEY_A, kid="key-a", **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "firebase-uid-1",
+        "email": "fb@example.com",
+        "iat": now,
+        "auth_time": now,
+        "exp": now + 3600,
+        **overrides,
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+class FakeCertEndpoint:
+    """Stands in for Google's cert URL; serves `responses` in turn."""
+
+    def __init__(self, *responses, max_age=3600):
+        self.responses = list(responses)
+        self.max_age = max_age
+        self.calls = 0
+
+    def __call__(self, _url):
+        self.calls += 1
+        keys = self.responses[min(self.calls, len(self.responses)) - 1]
+        if isinstance(keys, Exception):
+            raise keys
+        return {key["kid"]: key for key in keys}, self.max_age
+
+
+def _verifier(endpoint, min_refresh=0.0):
+    return FirebaseTokenVerifier(PROJECT_ID, CertificateCache(fetch=endpoint, min_refresh=min_refresh))
+
+
+def test_valid_token():
+    endpoint = FakeCertEndpoint([JWK_A])
+    claims = _verifier(endpoint).verify(_token())
+    assert claims["uid"] == "firebase-uid-1"
+    assert claims["email"] == "fb@example.com"
+
+
+def test_verified_tokens_and_certs_are_cached():
+    endpoint = FakeCertEndpoint([JWK_A])
+    verifier = _verifier(endpoint)
+    token = _token()
+    verifier.verify(token)
+    verifier.verify(token)
+    verifier.verify(_token(sub="firebase-uid-2"))
+    assert endpoint.calls == 1
+
+
+def test_expired_token():
+    now = int(time.time())
+    token = _token(iat=now - 7200, auth_time=now - 7200, exp=now - 3600)
+    with pytest.raises(InvalidFirebaseToken):
+        _verifier(FakeCertEndpoint([JWK_A])).verify(token)
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"aud": "another-project"},
+        {"iss": "https://securetoken.google.com/another-project"},
+        {"iss": "https://accounts.google.com"},
+    ],
+)
+def test_wrong_audience_or_issuer(overrides):
+    with pytest.raises(InvalidFirebaseToken):
+        _verifier(FakeCertEndpoint([JWK_A])).verify(_token(**overrides))
+
+
+def test_token_signed_by_another_key():
+    # kid says key-a but the signature is key-b's
+    with pytest.raises(InvalidFirebaseToken):
+        _verifier(FakeCertEndpoint([JWK_A])).verify(_token(KEY_B, kid="key-a"))
+
+
+def test_unknown_kid_triggers_refetch():
+    # Google rotated in key-b after our last fetch
+    endpoint = FakeCertEndpoint([JWK_A], [JWK_A, JWK_B])
+    verifier = _verifier(endpoint)
+    verifier.verify(_token())
+    assert endpoint.calls == 1
+
+    claims = verifier.verify(_token(KEY_B, kid="key-b"))
+    assert claims["uid"] == "firebase-uid-1"
+    assert endpoint.calls == 2
+
+
+def test_unknown_kid_refetch_is_throttled():
+    endpoint = FakeCertEndpoint([JWK_A])
+    verifier = _verifier(endpoint, min_refresh=60.0)
+    verifier.verify(_token())
+    for _ in range(3):
+        with pytest.raises(InvalidFirebaseToken):
+            verifier.verify(_token(KEY_B, kid="key-b"))
+    assert endpoint.calls == 1
+
+
+def test_login_with_firebase_token(client, monkeypatch):
+    monkeypatch.setattr(firebase_verifier, "project_id", PROJECT_ID)
+    monkeypatch.setattr(firebase_verifier, "certs", CertificateCache(fetch=FakeCertEndpoint([JWK_A])))
+
+    resp = client.post("/api/auth/firebase", json={"id_token": _token()})
+    assert resp.status_code == 200
+    assert resp.get_json()["user"]["email"] == "fb@example.com"
+
+    resp = client.post("/api/auth/firebase", json={"id_token": _token(aud="another-project")})
+    assert resp.status_code == 401
+
+
+def test_cert_fetch_failure_is_503(client, monkeypatch):
+    endpoint = FakeCertEndpoint(requests.ConnectionError("certs unreachable"))
+    monkeypatch.setattr(firebase_verifier, "project_id", PROJECT_ID)
+    monkeypatch.setattr(firebase_verifier, "certs", CertificateCache(fetch=endpoint))
+
+    resp = client.post("/api/auth/firebase", json={"id_token": _token()})
+    assert resp.status_code == 503
+    assert endpoint.calls == 1
@@ -0,0 +1,39 @@
+from app.extensions import db
+from app.models import Payment
+
+
+def _create_intent(client, headers, booking_id):
+    resp = client.post("/api/payments/create-intent", json={"booking_id": booking_id}, headers=headers)
+    assert resp.status_code == 201, resp.get_json()
+    return resp.get_json()["payment_intent_id"]
+
+
+def test_retry_is_idempotent_until_the_intent_is_canceled(
+    app, client, fake_stripe, make_user, make_space, make_booking
+):
+    user_id, headers = make_user()
+    booking_id = make_booking(user_id, make_space())
+
+    first = _create_intent(client, headers, booking_id)
+    assert _create_intent(client, headers, booking_id) == first
+
+    def cancel(intent_id):
+        fake_stripe.intents[intent_id]["status"] = "canceled"
+        with app.app_context():
+            Payment.query.filter_by(stripe_payment_intent_id=intent_id).one().status = "canceled"
+            db.session.commit()
+
+    cancel(first)
+    second = _create_intent(client, headers, booking_id)
+    assert second != first
+    assert _create_intent(client, headers, booking_id) == second
+
+    cancel(second)
+    third = _create_intent(client, headers, booking_id)
+    assert third not in (first, second)
+    assert _create_intent(client, headers, booking_id) == third
+
+    assert len(fake_stripe.intents) == 3
+    with app.app_context():
+        statuses = [p.status for p in Payment.query.filter_by(booking_id=booking_id).order_by(Payment.id)]
+    assert statuses == ["canceled", "canceled", "requires_payment_method"]
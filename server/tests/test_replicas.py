@@ -0,0 +1,105 @@
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from app.extensions import db
+from app.models import Space
+from app.utils.cache import space_cache
+from app.utils.replicas import replica_router
+
+
+def _replica(path, space_name):
+    """A stand-in replica: same schema, one space named differently."""
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            Space.__table__.insert().values(
+                id=1, name=space_name, description="d", price_per_hour=1, capacity=1, is_active=True
+            )
+        )
+    engine.dispose()
+
+
+def _use_replicas(app, *urls, retry_interval=10.0):
+    app.config.update(
+        DATABASE_REPLICA_URLS=",".join(urls),
+        REPLICA_RETRY_INTERVAL=retry_interval,
+        SPACES_CACHE_SIZE=0,
+    )
+    replica_router.init_app(app)
+    space_cache.init_app(app)
+
+
+@pytest.fixture(autouse=True)
+def _reset_router():
+    yield
+    for engine in replica_router.replicas:
+        engine.dispose()
+    replica_router.replicas = []
+    replica_router._cycle = None
+
+
+@pytest.fixture
+def primary_space(make_space):
+    return make_space(name="on-primary")
+
+
+def _space_name(client):
+    resp = client.get("/api/spaces/1")
+    assert resp.status_code == 200
+    return resp.get_json()["name"]
+
+
+def test_reads_round_robin_across_replicas(app, client, tmp_path, primary_space):
+    _replica(tmp_path / "r1.db", "on-r1")
+    _replica(tmp_path / "r2.db", "on-r2")
+    _use_replicas(app, f"sqlite:///{tmp_path / 'r1.db'}", f"sqlite:///{tmp_path / 'r2.db'}")
+
+    names = [_space_name(client) for _ in range(4)]
+    assert names == ["on-r1", "on-r2", "on-r1", "on-r2"]
+
+
+def test_healthy_replica_is_not_probed(app, client, tmp_path, primary_space):
+    _replica(tmp_path / "r1.db", "on-r1")
+    _use_replicas(app, f"sqlite:///{tmp_path / 'r1.db'}")
+    checkouts = []
+    event.listen(replica_router.replicas[0].pool, "checkout", lambda *args: checkouts.append(1))
+
+    for _ in range(3):
+        assert _space_name(client) == "on-r1"
+    # one checkout per request: the session's own
+    assert len(checkouts) == 3
+
+
+def test_writes_and_read_after_write_use_the_primary(app, tmp_path, primary_space):
+    _replica(tmp_path / "r1.db", "on-r1")
+    _use_replicas(app, f"sqlite:///{tmp_path / 'r1.db'}")
+
+    with app.test_request_context("/", method="POST"):
+        assert db.session.get(Space, 1).name == "on-primary"
+    with app.test_request_context("/", method="GET"):
+        assert db.session.get(Space, 1).name == "on-r1"
+        db.session.add(Space(name="new", description="d", price_per_hour=1, capacity=1))
+        db.session.flush()
+        assert db.session.get(Space, 1, populate_existing=True).name == "on-primary"
+        db.session.rollback()
+    with app.app_context():
+        assert db.session.get(Space, 1).name == "on-primary"
+
+
+def test_unavailable_replica_falls_back_to_primary(app, client, tmp_path, primary_space):
+    missing = tmp_path / "missing" / "r1.db"
+    _use_replicas(app, f"sqlite:///{missing}", retry_interval=0.2)
+
+    # the first read fails on the replica, marks it down and is retried on the primary
+    assert [_space_name(client) for _ in range(3)] == ["on-primary"] * 3
+    assert replica_router.replicas[0] in replica_router._down
+
+    missing.parent.mkdir()
+    _replica(missing, "on-r1")
+    assert _space_name(client) == "on-primary"  # still inside the retry interval
+    time.sleep(0.25)
+    assert _space_name(client) == "on-r1"
+    assert _space_name(client) == "on-r1"
@@ -0,0 +1,48 @@
+from app.utils.pagination import encode_cursor
+
+
+def test_fields_id_only(client, make_space):
+    make_space(name="A")
+    make_space(name="B")
+
+    resp = client.get("/api/spaces?fields=id")
+    assert resp.status_code == 200
+    assert resp.get_json() == [{"id": 1}, {"id": 2}]
+
+    resp = client.get("/api/spaces?fields=id&limit=1")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["spaces"] == [{"id": 1}]
+    assert body["next_cursor"]
+
+
+def test_paging_visits_every_space_once(client, make_space):
+    for i in range(5):
+        make_space(name=f"Space {i}", price_per_hour=100 * (5 - i))
+
+    seen, cursor = [], None
+    while True:
+        url = "/api/spaces?sort=price_asc&limit=2" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url).get_json()
+        seen += [space["id"] for space in body["spaces"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == [5, 4, 3, 2, 1]
+
+
+def test_tampered_cursor_is_rejected(client, make_space):
+    make_space()
+    tampered = [
+        encode_cursor(["id", {"x": 1}]),
+        encode_cursor(["id", [1]]),
+        encode_cursor(["id", True]),
+        encode_cursor(["id", "abc"]),
+        encode_cursor(["id", 1, 2]),
+        encode_cursor(["name", 1]),
+        "not-base64!",
+    ]
+    for cursor in tampered:
+        resp = client.get(f"/api/spaces?limit=1&cursor={cursor}")
+        assert resp.status_code == 400, cursor
+        assert resp.get_json() == {"error": "invalid cursor"}
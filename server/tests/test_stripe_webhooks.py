@@ -0,0 +1,138 @@
+import pytest
+
+from app.models import Invoice, Payment, StripeEvent
+from app.utils.fake_stripe import signed_event
+from app.utils.stripe_events import drain_events
+
+SECRET = "whsec_test"
+
+
+@pytest.fixture
+def webhooks(app):
+    app.config.update(STRIPE_WEBHOOK_SECRET=SECRET, STRIPE_CONFIRM_FALLBACK_AFTER=3600)
+
+
+@pytest.fixture
+def intent(app, client, webhooks, fake_stripe, make_user, make_space, make_booking):
+    """A created payment intent: (intent dict, auth headers)."""
+    user_id, headers = make_user()
+    booking_id = make_booking(user_id, make_space())
+    resp = client.post("/api/payments/create-intent", json={"booking_id": booking_id}, headers=headers)
+    assert resp.status_code == 201
+    return dict(fake_stripe.intents[resp.get_json()["payment_intent_id"]]), headers
+
+
+def _deliver(client, event_type, intent, event_id=None, secret=SECRET):
+    body, signature = signed_event(event_type, intent, secret, event_id=event_id)
+    return client.post(
+        "/api/payments/webhook",
+        data=body,
+        headers={"Stripe-Signature": signature, "Content-Type": "application/json"},
+    )
+
+
+def _payment(app, intent_id):
+    with app.app_context():
+        return Payment.query.filter_by(stripe_payment_intent_id=intent_id).one().status
+
+
+def _drain(app):
+    with app.app_context():
+        return drain_events()
+
+
+def test_bad_signature_is_rejected(app, client, intent):
+    pi, _headers = intent
+    assert _deliver(client, "payment_intent.succeeded", pi, secret="whsec_other").status_code == 400
+
+    body, _signature = signed_event("payment_intent.succeeded", pi, SECRET)
+    resp = client.post("/api/payments/webhook", data=body, headers={"Stripe-Signature": "t=1,v1=00"})
+    assert resp.status_code == 400
+    with app.app_context():
+        assert StripeEvent.query.count() == 0
+
+
+def test_duplicate_delivery_is_stored_once(app, client, intent):
+    pi, _headers = intent
+    succeeded = {**pi, "status": "succeeded"}
+    for _ in range(3):
+        assert _deliver(client, "payment_intent.succeeded", succeeded, event_id="evt_1").status_code == 200
+
+    with app.app_context():
+        assert StripeEvent.query.count() == 1
+    assert _drain(app) == 1
+    assert _drain(app) == 0
+    with app.app_context():
+        assert Invoice.query.count() == 1
+
+
+def test_drain_applies_events_and_confirm_reports_them(app, client, intent):
+    pi, headers = intent
+    confirm = f"/api/payments/confirm/{pi['id']}"
+
+    resp = client.post(confirm, headers=headers)
+    assert resp.status_code == 202
+    assert resp.headers["Retry-After"]
+
+    _deliver(client, "payment_intent.succeeded", {**pi, "status": "succeeded"})
+    assert _payment(app, pi["id"]) == "requires_payment_method"  # stored, not yet applied
+    assert _drain(app) == 1
+    assert _payment(app, pi["id"]) == "succeeded"
+    with app.app_context():
+        event = StripeEvent.query.one()
+        assert event.processed_at is not None and event.attempts == 0
+
+    resp = client.post(confirm, headers=headers)
+    assert resp.status_code == 200
+    assert resp.get_json()["invoice_id"]
+
+
+def test_out_of_order_events_do_not_regress_terminal_status(app, client, intent):
+    pi, headers = intent
+    _deliver(client, "payment_intent.succeeded", {**pi, "status": "succeeded"}, event_id="evt_2")
+    # delivered later, but describe the intent before it succeeded
+    _deliver(client, "payment_intent.processing", {**pi, "status": "processing"}, event_id="evt_1")
+    _deliver(client, "payment_intent.payment_failed", {**pi, "status": "requires_payment_method"}, event_id="evt_0")
+    assert _drain(app) == 3
+
+    assert _payment(app, pi["id"]) == "succeeded"
+    assert client.post(f"/api/payments/confirm/{pi['id']}", headers=headers).status_code == 200
+
+
+def test_payment_failed_is_reported(app, client, intent):
+    pi, headers = intent
+    _deliver(client, "payment_intent.payment_failed", {**pi, "status": "requires_payment_method"})
+    _drain(app)
+    assert _payment(app, pi["id"]) == "failed"
+    assert client.post(f"/api/payments/confirm/{pi['id']}", headers=headers).status_code == 409
+
+
+def test_event_for_unknown_payment_is_retried(app, client, webhooks):
+    _deliver(client, "payment_intent.succeeded", {"id": "pi_unknown", "status": "succeeded"})
+    assert _drain(app) == 0
+    with app.app_context():
+        event = StripeEvent.query.one()
+        assert event.processed_at is None
+        assert event.attempts == 1
+        assert "PaymentNotRecorded" in event.last_error
+
+
+def test_confirm_asks_stripe_once_the_webhook_is_overdue(app, client, intent, fake_stripe):
+    pi, headers = intent
+    confirm = f"/api/payments/confirm/{pi['id']}"
+    # paid at Stripe, but the webhook never arrives
+    fake_stripe.intents[pi["id"]]["status"] = "succeeded"
+
+    assert client.post(confirm, headers=headers).status_code == 202
+    assert _payment(app, pi["id"]) == "requires_payment_method"
+
+    app.config["STRIPE_CONFIRM_FALLBACK_AFTER"] = 0
+    resp = client.post(confirm, headers=headers)
+    assert resp.status_code == 200
+    assert resp.get_json()["invoice_id"]
+
+    # the late webhook is still applied harmlessly
+    _deliver(client, "payment_intent.succeeded", {**pi, "status": "succeeded"})
+    assert _drain(app) == 1
+    with app.app_context():
+        assert Invoice.query.count() == 1